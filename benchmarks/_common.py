@@ -0,0 +1,25 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Importing this module puts the repository root first on ``sys.path``, so the
+scripts benchmark the working tree rather than an installed copy.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, ROOT)
+
+# Width of the case name column in the printed tables.
+CASE_WIDTH = 60
+
+
+def best_time(fn, repeat):
+    """Best wall time of ``repeat`` calls of ``fn``, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
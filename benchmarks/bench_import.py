@@ -0,0 +1,74 @@
+"""
+Import time of the package and the heavy modules it pulls in.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-seconds 0.5]
+
+Every run imports ``preprocessing_tools`` in a fresh interpreter and
+reports the best wall time (total, and on top of numpy and pandas, which
+are always needed), the peak resident memory and which optional heavy
+dependencies the package imported. Modules that pandas itself imports (for
+example pyarrow with pandas 3) are not counted. The script exits with status 1
+when one of them is imported eagerly or when the package's own import time is
+above ``--max-seconds``, so it can guard against regressions in CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from _common import ROOT
+
+# Dependencies that must only be imported by the code paths that use them.
+LAZY_MODULES = ['matplotlib', 'seaborn', 'sklearn', 'scipy', 'pyarrow']
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import numpy, pandas
+dependencies = time.perf_counter()
+before = set(sys.modules)
+import preprocessing_tools
+end = time.perf_counter()
+print(json.dumps({
+    'seconds': end - start,
+    'own_seconds': end - dependencies,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'loaded': sorted(name for name in %r if name in sys.modules and name not in before),
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help="fail when the package's own import time is above this")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE % (LAZY_MODULES,)], capture_output=True, text=True,
+                                env=env, check=True).stdout
+        runs.append(json.loads(output))
+
+    best = min(run['seconds'] for run in runs)
+    own = min(run['own_seconds'] for run in runs)
+    rss = min(run['max_rss_kb'] for run in runs)
+    loaded = sorted(set().union(*(run['loaded'] for run in runs)))
+    print(f"import preprocessing_tools: {best * 1000:.1f} ms total, {own * 1000:.1f} ms on top of numpy and pandas "
+          f"(best of {args.repeat}), peak RSS {rss / 1024:.1f} MB")
+    print(f"heavy modules imported eagerly: {', '.join(loaded) or 'none'}")
+
+    failed = bool(loaded)
+    if args.max_seconds is not None and own > args.max_seconds:
+        print(f"import time is above the {args.max_seconds} s limit")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
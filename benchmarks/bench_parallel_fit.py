@@ -0,0 +1,65 @@
+"""
+Fit throughput of the scalers as a function of the number of worker processes.
+
+Usage:
+    python benchmarks/bench_parallel_fit.py [--rows 2000000] [--cols 50] [--jobs 1 2 4 8]
+
+For every scaler the in-memory ``fit`` and the CSV ``fit_csv`` are timed with
+each ``n_jobs`` value and reported as rows per second and speedup over the
+single-process fit.
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from _common import best_time
+from preprocessing_tools import MinMaxScaler, StandardScaler, MaxAbsScaler, RobustScaler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--cols', type=int, default=50)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-csv', action='store_true', help="only time the in-memory fit")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, args.cols))
+    scalers = [
+        ('MinMaxScaler', MinMaxScaler),
+        ('StandardScaler', StandardScaler),
+        ('MaxAbsScaler', MaxAbsScaler),
+        ('RobustScaler(sketch)', lambda: RobustScaler(method='sketch')),
+    ]
+
+    print(f"{args.rows} rows x {args.cols} columns, {os.cpu_count()} CPUs")
+    print(f"{'scaler':<22}{'input':<8}{'n_jobs':>7}{'seconds':>10}{'rows/s':>14}{'speedup':>9}")
+
+    for name, make in scalers:
+        baseline = None
+        for n_jobs in args.jobs:
+            seconds = best_time(lambda: make().fit(X, n_jobs=n_jobs), args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<22}{'array':<8}{n_jobs:>7}{seconds:>10.3f}{args.rows / seconds:>14,.0f}{baseline / seconds:>9.2f}")
+
+    if args.skip_csv:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        pd.DataFrame(X).to_csv(path, index=False)
+        for name, make in scalers:
+            baseline = None
+            for n_jobs in args.jobs:
+                seconds = best_time(lambda: make().fit_csv(path, n_jobs=n_jobs), 1)
+                baseline = baseline or seconds
+                print(f"{name:<22}{'csv':<8}{n_jobs:>7}{seconds:>10.3f}{args.rows / seconds:>14,.0f}{baseline / seconds:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Transform throughput of the scalers and ``normalize_data`` as a function of
+the number of threads, on wide inputs.
+
+Usage:
+    python benchmarks/bench_threads.py [--rows 20000] [--cols 2000] [--threads 1 2 4 8]
+
+Every fitted scaler's ``transform`` and every ``normalize_data`` method is
+timed with each ``n_threads`` value and reported as rows per second and
+speedup over the single-threaded run.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from _common import best_time
+from preprocessing_tools import DataTransformation, MaxAbsScaler, MinMaxScaler, RobustScaler, StandardScaler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--cols', type=int, default=2_000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.lognormal(size=(args.rows, args.cols))
+    data = pd.DataFrame(X)
+    cases = [(name, scaler.fit(X)) for name, scaler in [
+        ('MinMaxScaler', MinMaxScaler()),
+        ('StandardScaler', StandardScaler()),
+        ('MaxAbsScaler', MaxAbsScaler()),
+        ('RobustScaler', RobustScaler()),
+    ]]
+    transformation = DataTransformation()
+
+    print(f"{args.rows} rows x {args.cols} columns, {os.cpu_count()} CPUs")
+    print(f"{'operation':<36}{'n_threads':>10}{'seconds':>10}{'rows/s':>14}{'speedup':>9}")
+
+    def report(name, run):
+        baseline = None
+        for n_threads in args.threads:
+            seconds = best_time(lambda: run(n_threads), args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<36}{n_threads:>10}{seconds:>10.3f}{args.rows / seconds:>14,.0f}{baseline / seconds:>9.2f}")
+
+    for name, scaler in cases:
+        report(f'{name}.transform', lambda n_threads: scaler.transform(X, n_threads=n_threads))
+    for method in ('Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power'):
+        report(f'normalize_data({method})',
+               lambda n_threads: transformation.normalize_data(data, method, n_threads=n_threads))
+
+
+if __name__ == '__main__':
+    main()
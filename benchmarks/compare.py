@@ -0,0 +1,60 @@
+"""
+Compare two result files written by ``benchmarks/run_benchmarks.py``.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 0.10]
+
+Cases are matched on (case, size). The ratio is candidate / baseline, so a
+value above 1 means slower or more memory. The script exits with status 1
+when any time or peak memory ratio exceeds ``1 + threshold``.
+"""
+import argparse
+import json
+import sys
+
+from _common import CASE_WIDTH
+
+
+def _load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report['meta'], {(r['case'], r['size']): r for r in report['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown or memory growth reported as a regression")
+    args = parser.parse_args()
+
+    base_meta, baseline = _load(args.baseline)
+    cand_meta, candidate = _load(args.candidate)
+    print(f"baseline:  {base_meta.get('revision')} ({base_meta.get('timestamp')})")
+    print(f"candidate: {cand_meta.get('revision')} ({cand_meta.get('timestamp')})")
+    print(f"{'case':<{CASE_WIDTH}}{'size':<8}{'time':>9}{'memory':>9}")
+
+    regressions = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        time_ratio = new['seconds'] / old['seconds']
+        memory_ratio = new['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        flag = ''
+        if time_ratio > 1 + args.threshold or memory_ratio > 1 + args.threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key[0]:<{CASE_WIDTH}}{key[1]:<8}{time_ratio:>8.2f}x{memory_ratio:>8.2f}x{flag}")
+
+    for key in sorted(baseline.keys() - candidate.keys()):
+        print(f"{key[0]:<{CASE_WIDTH}}{key[1]:<8}  missing from candidate")
+    for key in sorted(candidate.keys() - baseline.keys()):
+        print(f"{key[0]:<{CASE_WIDTH}}{key[1]:<8}  new")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Wall time, throughput and peak memory of every preprocessing module.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes small medium] [--filter scaler] [--output results.json]
+
+Every case runs on synthetic data generated for each size preset
+(rows x numeric columns x categorical cardinality). Wall time is the best
+of ``--repeat`` runs; peak memory is measured with tracemalloc in one extra
+run so that tracing does not distort the timings; for the ``n_jobs`` cases
+it covers the parent process only. Results are written as JSON and can be
+compared between versions with ``benchmarks/compare.py``.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from _common import CASE_WIDTH
+from preprocessing_tools import (
+    Binning,
+    DataCleaner,
+    DataEncoding,
+    DataTransformation,
+    HandlingOutliers,
+    InteractionFeaturesGenerator,
+    MaxAbsScaler,
+    MinMaxScaler,
+    PolynomialFeaturesGenerator,
+    RobustScaler,
+    StandardScaler,
+)
+
+# Worker counts of the n_threads / n_jobs cases; the wider sweeps are in
+# bench_threads.py and bench_parallel_fit.py.
+WORKERS = (1, 2, 4)
+
+SIZES = {
+    'small': dict(rows=10_000, cols=10, cardinality=10),
+    'medium': dict(rows=200_000, cols=20, cardinality=100),
+    'large': dict(rows=2_000_000, cols=50, cardinality=1_000),
+}
+
+
+def make_numeric(rows, cols, seed=0):
+    """Positive, right-skewed float columns named x0, x1, ..."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.lognormal(size=(rows, cols)), columns=[f'x{j}' for j in range(cols)])
+
+
+def make_categorical(rows, cols, cardinality, seed=0):
+    """String columns named c0, c1, ... with Zipf-distributed levels."""
+    rng = np.random.default_rng(seed)
+    levels = np.array([f'level_{i}' for i in range(cardinality)], dtype=object)
+    weights = 1.0 / np.arange(1, cardinality + 1)
+    weights /= weights.sum()
+    return pd.DataFrame({f'c{j}': levels[rng.choice(cardinality, rows, p=weights)] for j in range(cols)})
+
+
+def _cases(size):
+    """(name, prepare, run) triples; prepare builds a fresh input outside the timed region."""
+    rows, cols, cardinality = size['rows'], size['cols'], size['cardinality']
+    numeric = make_numeric(rows, cols)
+    X = numeric.to_numpy()
+    categorical = make_categorical(rows, 3, cardinality)
+    categories = {column: sorted(categorical[column].unique()) for column in categorical.columns}
+    few = list(numeric.columns[:5])
+    # About ten rows per group.
+    grouped = numeric.assign(group=np.random.default_rng(1).integers(0, max(1, rows // 10), rows))
+    # 1% of the values missing, so that about a fifth of the rows need imputing.
+    gappy = numeric.mask(np.random.default_rng(2).random(numeric.shape) < 0.01)
+
+    cases = [
+        ('scaler.MinMaxScaler.fit_transform', lambda: X, lambda X: MinMaxScaler().fit_transform(X)),
+        ('scaler.StandardScaler.fit_transform', lambda: X, lambda X: StandardScaler().fit_transform(X)),
+        ('scaler.MaxAbsScaler.fit_transform', lambda: X, lambda X: MaxAbsScaler().fit_transform(X)),
+        ('scaler.RobustScaler.fit_transform', lambda: X, lambda X: RobustScaler().fit_transform(X)),
+        ('scaler.RobustScaler(sketch).fit_transform', lambda: X,
+         lambda X: RobustScaler(method='sketch').fit_transform(X)),
+        ('scaler.StandardScaler(groupby).fit_transform', lambda: grouped,
+         lambda data: StandardScaler(groupby='group').fit_transform(data)),
+        ('scaler.RobustScaler(groupby).fit_transform', lambda: grouped,
+         lambda data: RobustScaler(groupby='group').fit_transform(data)),
+        ('outliers.remove_outliers(groupby)', lambda: grouped,
+         lambda data: HandlingOutliers(data).remove_outliers(few, 'IQR', groupby='group')),
+    ]
+    # Every incomplete row is compared with every complete one, so larger
+    # presets sample the reference rows; KNNImputer only runs on the smallest.
+    max_reference = None if rows <= 10_000 else 20_000
+    cases.append(('cleaner.fill_with_knn(blocked)', lambda: gappy,
+                  lambda data: DataCleaner(data).fill_with_knn(5, method='blocked', max_reference=max_reference,
+                                                               random_state=0)))
+    if rows <= 10_000:
+        cases.append(('cleaner.fill_with_knn(sklearn)', lambda: gappy,
+                      lambda data: DataCleaner(data).fill_with_knn(5)))
+    scalers = [('MinMaxScaler', MinMaxScaler), ('StandardScaler', StandardScaler), ('MaxAbsScaler', MaxAbsScaler),
+               ('RobustScaler(sketch)', lambda: RobustScaler(method='sketch'))]
+    for name, make in scalers:
+        fitted = make().fit(X)
+        for workers in WORKERS:
+            cases.append((f'scaler.{name}.transform(n_threads={workers})', lambda: X,
+                          lambda X, fitted=fitted, workers=workers: fitted.transform(X, n_threads=workers)))
+        for workers in WORKERS[1:]:
+            cases.append((f'scaler.{name}.fit(n_jobs={workers})', lambda: X,
+                          lambda X, make=make, workers=workers: make().fit(X, n_jobs=workers)))
+    for workers in WORKERS[1:]:
+        cases.append((f'transform.normalize_data.Standard(n_threads={workers})', lambda: numeric,
+                      lambda data, workers=workers: DataTransformation().normalize_data(data, 'Standard',
+                                                                                        n_threads=workers)))
+    for method in ('Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power'):
+        cases.append((f'transform.normalize_data.{method}', lambda: numeric,
+                      lambda data, method=method: DataTransformation().normalize_data(data, method)))
+    for method in ('Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power', 'BoxCox', 'YeoJohnson'):
+        cases.append((f'transform.DataTransformation(fitted).{method}', lambda: numeric,
+                      lambda data, method=method: DataTransformation(method).fit_transform(data)))
+    cases += [
+        ('encoding.label_encode', lambda: categorical.copy(),
+         lambda data: DataEncoding().label_encode(data, list(data.columns))),
+        ('encoding.one_hot_encode', lambda: categorical.copy(),
+         lambda data: DataEncoding().one_hot_encode(data, list(data.columns))),
+        ('encoding.one_hot_encode(sparse)', lambda: categorical.copy(),
+         lambda data: DataEncoding().one_hot_encode(data, list(data.columns), sparse=True)),
+        ('encoding.ordinal_encode', lambda: categorical.copy(),
+         lambda data: DataEncoding().ordinal_encode(data, list(data.columns), categories)),
+        ('outliers.z_score', lambda: numeric.copy(),
+         lambda data: HandlingOutliers(data).z_score('x0', (-3, 3))),
+        ('outliers.IQR', lambda: numeric.copy(), lambda data: HandlingOutliers(data).IQR('x0')),
+        ('outliers.remove_outliers', lambda: numeric,
+         lambda data: HandlingOutliers(data).remove_outliers(list(data.columns))),
+        ('binning.create_bins', lambda: numeric.copy(), lambda data: Binning(data).create_bins('x0', 10)),
+        ('features.interaction', lambda: numeric,
+         lambda data: InteractionFeaturesGenerator(data).create_interaction_features(few)),
+        # The original path (powers of each column, added to the frame one
+        # at a time) next to polynomial_matrix, which also computes the cross
+        # terms (55 features instead of 10 here) into one preallocated array.
+        ('features.create_polynomial_features', lambda: numeric[few].copy(),
+         lambda data: PolynomialFeaturesGenerator(data).create_polynomial_features(few, 3)),
+        ('features.polynomial_matrix', lambda: numeric,
+         lambda data: PolynomialFeaturesGenerator(data).polynomial_matrix(few, 3)),
+        ('features.polynomial', lambda: numeric,
+         lambda data: PolynomialFeaturesGenerator(data).create_polynomial_expansion(few, 3)),
+    ]
+    return cases
+
+
+def _measure(prepare, run, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        data = prepare()
+        start = time.perf_counter()
+        run(data)
+        best = min(best, time.perf_counter() - start)
+    data = prepare()
+    tracemalloc.start()
+    try:
+        run(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--filter', default='', help="only run cases whose name contains this string")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<{CASE_WIDTH}}{'size':<8}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}")
+    for size_name in args.sizes:
+        size = SIZES[size_name]
+        for name, prepare, run in _cases(size):
+            if args.filter not in name:
+                continue
+            seconds, peak = _measure(prepare, run, args.repeat)
+            results.append(dict(case=name, size=size_name, **size, seconds=seconds,
+                                rows_per_second=size['rows'] / seconds, peak_bytes=peak))
+            print(f"{name:<{CASE_WIDTH}}{size_name:<8}{seconds:>10.4f}{size['rows'] / seconds:>14,.0f}{peak / 2**20:>10.1f}")
+
+    report = dict(
+        meta=dict(
+            revision=_git_revision(),
+            timestamp=time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            python=platform.python_version(),
+            numpy=np.__version__,
+            pandas=pd.__version__,
+            platform=platform.platform(),
+            cpu_count=os.cpu_count(),
+            repeat=args.repeat,
+        ),
+        results=results,
+    )
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,8 @@
-from .data_cleaner import DataCleaner
+from .data_cleaner import DataCleaner, SimpleImputer
 from ._utils import ScalerMixin
-from .binning import Binning
-from .dataEncoding import DataEncoding
-from .handling_outliers import HandlingOutliers
+from .binning import Binning, Binner
+from .dataEncoding import DataEncoding, OneHotEncoder, LabelEncoder, OrdinalEncoder
+from .handling_outliers import HandlingOutliers, OutlierDetector
 from .interaction_features import InteractionFeaturesGenerator
 from .polynomial_features import PolynomialFeaturesGenerator
 from .scaler import (
@@ -12,3 +12,19 @@ from .scaler import (
     MaxAbsScaler,
 )
 from .transform import DataTransformation
+from .pipeline import (
+    Pipeline,
+    ImputeStep,
+    EncodeStep,
+    PolynomialStep,
+    InteractionStep,
+)
+from .instrumentation import (
+    profile,
+    add_hook,
+    remove_hook,
+    LoggingSink,
+    Profiler,
+)
+from .persistence import save, load
+from .memory import optimize_dtypes, memory_report
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+# Rows gathered and scaled at a time by ``scale_groups``.
+GROUP_BLOCK_ROWS = 1 << 16
+
+
+def group_columns(data: pd.DataFrame, groupby) -> list:
+    """The ``groupby`` column (or list of columns) of ``data``, as a list."""
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError("groupby requires a pandas DataFrame holding the group columns.")
+    columns = list(groupby) if isinstance(groupby, (list, tuple)) else [groupby]
+    missing = [column for column in columns if column not in data.columns]
+    if missing:
+        raise ValueError(f"Group columns {missing} do not exist in the DataFrame.")
+    return columns
+
+
+def factorize_groups(data: pd.DataFrame, columns: list):
+    """
+    Dense group codes of the rows of ``data`` and the keys of the groups.
+
+    Returns ``(codes, groups)`` where ``codes[i]`` is the position in
+    ``groups`` (a ``pd.Index``, or a ``pd.MultiIndex`` for several columns) of
+    the key of row ``i``. Missing keys form a group of their own.
+    """
+    codes, uniques = pd.factorize(data[columns[0]], use_na_sentinel=False)
+    if len(columns) == 1:
+        return codes, pd.Index(uniques, name=columns[0])
+    for column in columns[1:]:
+        # Both codes are below the number of rows, so the pair fits in int64
+        # and is compressed back to dense codes after every column.
+        more, more_uniques = pd.factorize(data[column], use_na_sentinel=False)
+        codes, _ = pd.factorize(codes.astype(np.int64) * len(more_uniques) + more)
+    first = np.empty(codes.max() + 1 if len(codes) else 0, dtype=np.int64)
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return codes, pd.MultiIndex.from_frame(data[columns].iloc[first].reset_index(drop=True))
+
+
+def group_codes(data: pd.DataFrame, columns: list, groups: pd.Index) -> np.ndarray:
+    """Positions in the fitted ``groups`` of the keys of ``data``; raises for keys not seen during fit."""
+    keys = pd.MultiIndex.from_frame(data[columns]) if isinstance(groups, pd.MultiIndex) else data[columns[0]]
+    codes = groups.get_indexer(keys)
+    unseen = codes < 0
+    if unseen.any():
+        examples = list(pd.unique(np.asarray(keys)[unseen])[:5])
+        raise ValueError(f"{int(unseen.sum())} rows belong to groups that were not seen during fit, e.g. {examples}")
+    return codes
+
+
+def group_moments(X: np.ndarray, codes: np.ndarray, n_groups: int):
+    """
+    Per-group, per-column non-NaN count, mean and sum of squared deviations,
+    each of shape ``(n_groups, n_columns)``.
+
+    Every column is reduced with ``np.bincount`` over the group codes (one
+    pass for the sums, one for the deviations), so the cost does not depend
+    on the number of groups.
+    """
+    shape = (n_groups, X.shape[1])
+    n, mean, m2 = np.empty(shape), np.empty(shape), np.empty(shape)
+    for j in range(X.shape[1]):
+        x = X[:, j]
+        valid = ~np.isnan(x)
+        c, v = (codes, x) if valid.all() else (codes[valid], x[valid])
+        n[:, j] = np.bincount(c, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean[:, j] = np.bincount(c, weights=v, minlength=n_groups) / n[:, j]
+        deviation = v - mean[c, j]
+        m2[:, j] = np.bincount(c, weights=deviation * deviation, minlength=n_groups)
+    return n, mean, m2
+
+
+def group_quantiles(X: np.ndarray, codes: np.ndarray, n_groups: int, percentiles=(), median: bool = False):
+    """
+    Per-group, per-column median (when ``median``) followed by each of
+    ``percentiles``, as an array of shape ``(k, n_groups, n_columns)``.
+
+    Each column is sorted once by (group, value); the order statistics of
+    every group are then gathered from the sorted column at once. NaNs are
+    ignored and the values are those of ``np.nanmedian`` and
+    ``np.nanpercentile`` (linear interpolation); groups without values give
+    NaN.
+    """
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    result = np.empty((int(median) + len(percentiles), n_groups, X.shape[1]))
+    for j in range(X.shape[1]):
+        x = X[:, j].astype(np.float64, copy=False)
+        valid = ~np.isnan(x)
+        n = sizes if valid.all() else np.bincount(codes[valid], minlength=n_groups)
+        # Sorting by (group, value) is a sort of unique int64 keys, the group
+        # code times the number of rows plus the rank of the value, which is
+        # several times faster than np.lexsort. NaNs rank last in their group.
+        by_value = np.argsort(x)
+        rank = np.empty(len(x), dtype=np.int64)
+        rank[by_value] = np.arange(len(x))
+        keys = np.sort(codes.astype(np.int64) * len(x) + rank)
+        ordered = x[by_value][keys % len(x)]
+        empty = n == 0
+        last = starts + np.maximum(n - 1, 0)
+        k = 0
+        if median:
+            low, high = ordered[starts + (n - 1) // 2 * ~empty], ordered[starts + n // 2 * ~empty]
+            result[k, :, j] = np.where(n % 2 == 1, low, (low + high) / 2)
+            result[k, empty, j] = np.nan
+            k += 1
+        for percentile in percentiles:
+            # Same steps as the 'linear' method of np.percentile, including
+            # its interpolation from the upper neighbour when gamma >= 0.5.
+            virtual = (n - 1) * np.true_divide(percentile, 100)
+            previous = np.floor(virtual)
+            gamma = virtual - previous
+            above = virtual >= n - 1
+            previous = starts + previous.astype(np.intp)
+            a = np.where(above, ordered[last], ordered[np.minimum(previous, last)])
+            b = np.where(above, ordered[last], ordered[np.minimum(previous + 1, last)])
+            diff = b - a
+            values = a + diff * gamma
+            upper = gamma >= 0.5
+            values[upper] = (b - diff * (1 - gamma))[upper]
+            values[empty] = np.nan
+            result[k, :, j] = values
+            k += 1
+    return result
+
+
+def scale_groups(X: np.ndarray, codes: np.ndarray, shift: np.ndarray, scale: np.ndarray, start: int = 0,
+                 stop: int = None, block_rows: int = GROUP_BLOCK_ROWS):
+    """
+    ``X[i] = (X[i] - shift[codes[i]]) / scale[codes[i]]`` in place for the rows
+    ``start:stop``, gathering the statistics of a block of rows at a time.
+    """
+    stop = len(X) if stop is None else stop
+    shift = shift.astype(X.dtype, copy=False)
+    scale = scale.astype(X.dtype, copy=False)
+    for begin in range(start, stop, block_rows):
+        end = min(begin + block_rows, stop)
+        block, c = X[begin:end], codes[begin:end]
+        np.subtract(block, shift[c], out=block)
+        np.divide(block, scale[c], out=block)
+    return X
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch for a single feature (KLL-style).
+
+    Values are kept in a stack of levels where an item on level ``h`` stands
+    for ``2**h`` input values. When a level grows past its capacity it is
+    sorted and every other item (starting at a random offset) is promoted to
+    the next level. Memory stays around ``3 * k`` items whatever the number
+    of values seen, and two sketches built on different shards can be merged
+    into one that is as accurate as a sketch built on the union.
+
+    Parameters
+    ----------
+    k : int
+        Accuracy parameter. Larger values give smaller rank error at the cost
+        of more memory; the error shrinks roughly like ``1 / k``.
+    random_state : int or np.random.Generator, optional
+        Seed for the compaction offsets.
+    """
+
+    def __init__(self, k=200, random_state=None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._levels = [np.empty(0)]
+        # Sum of squared weights of all compactions; each compaction at level
+        # h shifts the rank of any value by at most 2**h, with zero mean.
+        self._variance = 0.0
+        self._rng = np.random.default_rng(random_state)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        while True:
+            for h, items in enumerate(self._levels):
+                if items.size > self._capacity(h):
+                    break
+            else:
+                return
+            if h + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+            items = np.sort(items)
+            odd = items.size % 2
+            offset = self._rng.integers(2)
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], items[odd + offset::2]])
+            self._levels[h] = items[:odd]
+            self._variance += 4.0 ** h
+
+    def update(self, values):
+        """
+        Add the non-NaN entries of ``values`` to the sketch.
+        """
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self.n += values.size
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one in place.
+        """
+        if not isinstance(other, QuantileSketch):
+            raise TypeError("other should be a QuantileSketch")
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self._variance += other._variance
+        self._compress()
+        return self
+
+    def weighted_items(self):
+        """
+        Sorted retained items and the number of input values each stands for.
+        """
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """
+        Estimate the quantiles ``q`` (in ``[0, 1]``) of the values seen so far.
+
+        While no compaction has happened the sketch still holds every value
+        and the result equals ``np.quantile`` on the data.
+        """
+        q = np.asarray(q, dtype='float64')
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Quantiles must be in the range [0, 1]")
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        if self.is_exact():
+            return np.quantile(self._levels[0], q)
+        items, weights = self.weighted_items()
+        cumulative = np.cumsum(weights)
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return items[np.clip(idx, 0, items.size - 1)]
+
+    def is_exact(self):
+        """
+        Whether the sketch still holds every value it has seen.
+        """
+        return self._variance == 0
+
+    def rank_error(self, confidence=0.99):
+        """
+        Normalised rank error bound achieved by the sketch.
+
+        A quantile estimate for ``q`` has a true rank within
+        ``q +/- rank_error()`` with probability at least ``confidence``
+        (Hoeffding bound over the recorded compactions). Returns ``0.0``
+        while the sketch is exact.
+        """
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be in the open interval (0, 1)")
+        if self.n == 0 or self.is_exact():
+            return 0.0
+        return float(np.sqrt(2.0 * self._variance * np.log(2.0 / (1.0 - confidence))) / self.n)
@@ -1,7 +1,90 @@
+import functools
+import io
+import operator
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
 import pandas as pd
 import numpy as np
+from .instrumentation import instrumented
+from ._groups import factorize_groups, group_codes, group_columns, scale_groups
+
+# Number of CSV rows parsed at a time by the streaming ``*_csv`` methods.
+CSV_CHUNKSIZE = 100_000
+# Number of bytes parsed at a time by each worker of a parallel ``fit_csv``.
+CSV_BLOCK_BYTES = 1 << 26
+# Number of array elements per row block when statistics are reduced blockwise.
+BLOCK_ELEMENTS = 1 << 20
+# Bytes of output handled per row block by the pipeline and DataTransformation;
+# small enough for the block to stay in cache while every stage runs over it.
+BLOCK_BYTES = 1 << 20
+# Lower bound on the rows per block so very wide outputs do not degenerate
+# into per-row Python overhead.
+MIN_BLOCK_ROWS = 1024
+# Inputs smaller than this many elements are transformed in the calling thread.
+MIN_THREADED_ELEMENTS = 1 << 16
+# Number of parsed or transformed chunks buffered between the threads of ``transform_csv_to``.
+PREFETCH_CHUNKS = 2
+# File extensions understood by the ``*_file`` methods.
+FILE_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'arrow',
+    '.arrow': 'arrow',
+    '.ipc': 'arrow',
+    '.npy': 'npy',
+}
+
 
 class ScalerMixin:
+    """
+    Input handling shared by the scalers.
+
+    Copy guarantees
+    ---------------
+    Input is converted to the scaler's ``dtype``. With the default
+    ``dtype=None`` float32 input (or a DataFrame whose numeric columns all fit
+    in float32, such as float32 and int8 columns) stays float32 end to end
+    and any other input is converted to float64:
+
+    * ``fit`` / ``partial_fit`` never modify the input and do not copy an
+      ndarray, or a DataFrame whose columns are all numeric and stored as one
+      block, that already has the scaler's dtype. Statistics are reduced in
+      row blocks, so temporaries stay small.
+    * ``transform`` with ``copy=True`` (the default) makes exactly one copy of
+      the input and scales that copy in place.
+    * ``transform`` with ``copy=False`` scales the input in place and returns
+      it when it is a writeable, C- or F-contiguous 2-D ndarray of the
+      scaler's dtype. Any other input (DataFrames, lists, other dtypes or
+      strided views) is copied once, as with ``copy=True``.
+
+    Threading
+    ---------
+    ``transform(X, n_threads=k)`` splits the rows into ``k`` blocks and
+    transforms them on a thread pool (NumPy ufuncs release the GIL), writing
+    into the single output buffer. When a copy is needed for an ndarray
+    input, each thread also copies its own block, so the copy is parallel
+    too. Results are identical to ``n_threads=None``.
+
+    Groups
+    ------
+    Scalers constructed with ``groupby`` (a column or list of columns) learn
+    one set of statistics per group of rows of a DataFrame. The group
+    columns are not scaled; ``groups_`` holds the group keys and the fitted
+    attributes get one row per group. ``transform`` maps every row to its
+    group and applies that group's statistics with a vectorized gather.
+    """
+
+    # Numeric column names (in fit order) when fitted on a DataFrame.
+    feature_names_in_ = None
+    # Fitted attribute that is None until the scaler has been fitted.
+    _fitted_attribute = 'scale_'
+    # Column (or list of columns) whose values define the groups, if any.
+    groupby = None
+
     def _read_csv(self, path):
         try:
             X = pd.read_csv(path)
@@ -15,35 +98,734 @@ class ScalerMixin:
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {str(e)}")
 
-    def fit_csv(self, path):
-        X = self._read_csv(path)
-        return self.fit(X)
+    def _read_csv_chunks(self, path, chunksize=CSV_CHUNKSIZE):
+        """
+        Yield the CSV file at ``path`` as DataFrames of at most ``chunksize`` rows.
+
+        Only one chunk is held in memory at a time. Raises the same errors as
+        ``_read_csv``.
+        """
+        if chunksize is None or chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        try:
+            reader = pd.read_csv(path, chunksize=chunksize)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"The file at {path} was not found.")
+        except pd.errors.EmptyDataError:
+            raise ValueError("The CSV file is empty.")
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {str(e)}")
+
+        empty = True
+        with reader:
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    raise ValueError(f"Error reading CSV file: {str(e)}")
+                if chunk.empty:
+                    continue
+                empty = False
+                yield chunk
+        if empty:
+            raise ValueError("The CSV file is empty.")
+
+    def _read_numeric_csv_chunks(self, path, chunksize=CSV_CHUNKSIZE):
+        # The numeric columns are taken from the first chunk so that every
+        # later chunk yields the same features (and the non-numeric warning
+        # is printed once per file rather than once per chunk).
+        columns = None
+        for chunk in self._read_csv_chunks(path, chunksize):
+            if columns is None:
+                columns = chunk.select_dtypes(include=[np.number]).columns
+                yield chunk
+                continue
+            try:
+                yield chunk[columns]
+            except KeyError as e:
+                raise ValueError(f"Error reading CSV file: {str(e)}")
+
+    def _supports_partial_fit(self):
+        return hasattr(self, 'partial_fit')
+
+    @instrumented
+    def fit_csv(self, path, chunksize=CSV_CHUNKSIZE, n_jobs=None):
+        if not self._supports_partial_fit():
+            X = self._read_csv(path)
+            return self.fit(X, n_jobs=n_jobs)
+
+        self._reset()
+        if _effective_n_jobs(n_jobs) > 1:
+            self._parallel_fit_csv(path, n_jobs)
+        else:
+            for chunk in self._read_numeric_csv_chunks(path, chunksize):
+                self.partial_fit(chunk)
+        self._check_scale()
+        return self
+
+    @instrumented
+    def transform_csv(self, path, chunksize=CSV_CHUNKSIZE):
+        self._check_not_grouped('transform_csv')
+        parts = [self.transform(chunk) for chunk in self._read_numeric_csv_chunks(path, chunksize)]
+        return np.concatenate(parts, axis=0)
+
+    @instrumented
+    def transform_csv_to(self, path_in, path_out, chunksize=CSV_CHUNKSIZE, prefetch=PREFETCH_CHUNKS):
+        """
+        Transform the CSV file at ``path_in`` chunk by chunk and write the
+        result to ``path_out`` (CSV, or Parquet for a .parquet/.pq path).
+
+        A reader thread parses the next chunks while the current one is
+        transformed, and a writer thread writes the finished ones, so parsing,
+        scaling and writing overlap. At most ``prefetch`` chunks wait on each
+        side, which bounds memory whatever the file size; ``prefetch=0`` runs
+        everything in the calling thread (for single-core machines). The
+        numeric columns (taken from the first chunk) are scaled; the other
+        columns are written unchanged in their original position.
+        """
+        self._check_is_fitted()
+        self._check_not_grouped('transform_csv_to')
+        writer = _ChunkWriter(path_out, prefetch)
+        numeric = None
+        try:
+            for chunk in _prefetch(self._read_csv_chunks(path_in, chunksize), prefetch):
+                if numeric is None:
+                    numeric = chunk.select_dtypes(include=[np.number]).columns
+                chunk[numeric] = self.transform(chunk[numeric])
+                writer.put(chunk)
+        except BaseException:
+            writer.close(abort=True)
+            raise
+        writer.close()
+        return path_out
+
+    @instrumented
+    def fit_transform_csv(self, path, chunksize=CSV_CHUNKSIZE):
+        if not self._supports_partial_fit():
+            X = self._read_csv(path)
+            return self.fit_transform(X)
+        return self.fit_csv(path, chunksize).transform_csv(path, chunksize)
+
+    def _file_format(self, path):
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension == '.csv':
+            return 'csv'
+        if extension not in FILE_FORMATS:
+            raise ValueError(f"Unsupported file format '{extension}'. Expected one of: .csv, "
+                             f"{', '.join(FILE_FORMATS)}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"The file at {path} was not found.")
+        return FILE_FORMATS[extension]
+
+    def _read_file_chunks(self, path, chunksize=CSV_CHUNKSIZE):
+        """
+        Yield the numeric columns of a Parquet, Feather/Arrow IPC or ``.npy``
+        file as blocks of at most ``chunksize`` rows.
+
+        The numeric columns are selected from the file schema and only those
+        are passed to the reader, so the other columns are never decoded.
+        ``.npy`` files are memory-mapped and yielded as views of the map.
+        """
+        if chunksize is None or chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        file_format = self._file_format(path)
+        if file_format == 'csv':
+            yield from self._read_numeric_csv_chunks(path, chunksize)
+            return
+        if file_format == 'npy':
+            X = np.load(path, mmap_mode='r')
+            if X.ndim != 2 or X.shape[0] == 0:
+                raise ValueError("The .npy file must hold a non-empty 2-D array.")
+            for start in range(0, X.shape[0], chunksize):
+                yield X[start:start + chunksize]
+            return
+
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet and Feather files requires pyarrow (pip install pyarrow).")
+
+        def numeric(schema):
+            columns = [field.name for field in schema
+                       if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+            if not columns:
+                raise ValueError("No numeric columns found in the file")
+            if len(columns) != len(schema.names):
+                print("WARNING! Not all columns in the file are numeric. Non-numeric columns will be skipped.")
+            return columns
+
+        try:
+            if file_format == 'parquet':
+                reader = pq.ParquetFile(path)
+                batches = reader.iter_batches(batch_size=chunksize, columns=numeric(reader.schema_arrow))
+            else:
+                with pa.memory_map(str(path)) as source:
+                    schema = pa.ipc.open_file(source).schema
+                table = feather.read_table(path, columns=numeric(schema), memory_map=True)
+                batches = table.to_batches(max_chunksize=chunksize)
+            empty = True
+            for batch in batches:
+                if batch.num_rows:
+                    empty = False
+                    yield batch.to_pandas()
+        except (pa.ArrowException, OSError) as e:
+            raise ValueError(f"Error reading file: {str(e)}")
+        if empty:
+            raise ValueError("The file is empty.")
+
+    @instrumented
+    def fit_file(self, path, chunksize=CSV_CHUNKSIZE):
+        """
+        Fit on a CSV, Parquet, Feather/Arrow IPC or ``.npy`` file, streaming
+        it through ``partial_fit`` one block of rows at a time. Only the
+        numeric columns are read.
+        """
+        chunks = self._read_file_chunks(path, chunksize)
+        if not self._supports_partial_fit():
+            chunks = list(chunks)
+            return self.fit(np.concatenate(chunks) if isinstance(chunks[0], np.ndarray) else pd.concat(chunks))
+
+        self._reset()
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        self._check_scale()
+        return self
+
+    @instrumented
+    def transform_file(self, path, chunksize=CSV_CHUNKSIZE):
+        self._check_not_grouped('transform_file')
+        parts = [self.transform(chunk) for chunk in self._read_file_chunks(path, chunksize)]
+        return np.concatenate(parts, axis=0)
+
+    @instrumented
+    def fit_transform_file(self, path, chunksize=CSV_CHUNKSIZE):
+        return self.fit_file(path, chunksize).transform_file(path, chunksize)
+
+    def _accumulate_stats(self, X):
+        """
+        Fold the statistics of ``X`` into the running statistics of the scaler.
+
+        Subclasses provide ``_compute_stats(X)`` returning a tuple of
+        per-feature sequences and ``_merge_stats(a, b)`` combining two such
+        tuples exactly.
+        """
+        if self._stats is None:
+            self._set_feature_names(X)
+        X = self._validate_data(X, copy=False)
+        stats = self._compute_stats(X)
+        if self._stats is not None:
+            if X.shape[1] != len(self._stats[0]):
+                raise ValueError(
+                    f"X has {X.shape[1]} features, but the scaler was fitted with {len(self._stats[0])} features"
+                )
+            stats = self._merge_stats(self._stats, stats)
+        self._stats = stats
+        return stats
+
+    def _shard_stats_functions(self, n_shards):
+        return [self._compute_stats] * n_shards
+
+    def _parallel_fit(self, X, n_jobs):
+        """
+        Fit on ``X`` by splitting its rows across a process pool.
+
+        The validated array is placed in shared memory once; every worker
+        computes the statistics of its row range and the parent merges them
+        with ``_merge_stats``, which is exact for every scaler.
+        """
+        self._set_feature_names(X)
+        X = self._validate_data(X, copy=False)
+        n_jobs = min(_effective_n_jobs(n_jobs), X.shape[0])
+        bounds = np.linspace(0, X.shape[0], n_jobs + 1).astype(int)
+        shape, dtype = X.shape, X.dtype.str
+        shm = shared_memory.SharedMemory(create=True, size=X.nbytes)
+        try:
+            shared = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+            shared[...] = X
+            del X, shared
+            with ProcessPoolExecutor(n_jobs) as pool:
+                futures = [
+                    pool.submit(_shard_stats, stats_fn, shm.name, shape, dtype, bounds[i], bounds[i + 1])
+                    for i, stats_fn in enumerate(self._shard_stats_functions(n_jobs))
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+        self._merge_shard_results(results)
+        return self
+
+    def _parallel_fit_csv(self, path, n_jobs):
+        """
+        Fit on the CSV file at ``path`` by splitting it into byte ranges that
+        are parsed and reduced by a process pool.
+
+        Ranges are aligned on line breaks, so quoted fields must not contain
+        newlines.
+        """
+        head = self._read_csv_chunks(path, chunksize=1000)
+        try:
+            first = next(head)
+        finally:
+            head.close()
+        self._validate_data(first)
+        self._set_feature_names(first)
+        names = list(first.columns)
+        columns = list(first.select_dtypes(include=[np.number]).columns)
+
+        n_jobs = _effective_n_jobs(n_jobs)
+        with open(path, 'rb') as f:
+            f.readline()
+            start = f.tell()
+            end = os.fstat(f.fileno()).st_size
+            offsets = [start]
+            for i in range(1, n_jobs):
+                f.seek(max(start + (end - start) * i // n_jobs, offsets[-1]))
+                if f.tell() > start:
+                    f.seek(f.tell() - 1)
+                f.readline()
+                offsets.append(min(f.tell(), end))
+            offsets.append(end)
+        ranges = [(a, b) for a, b in zip(offsets[:-1], offsets[1:]) if b > a]
+
+        with ProcessPoolExecutor(len(ranges)) as pool:
+            futures = [
+                pool.submit(_csv_range_stats, path, a, b, names, columns, stats_fn, self._merge_stats,
+                            self._input_dtype(first[columns]))
+                for (a, b), stats_fn in zip(ranges, self._shard_stats_functions(len(ranges)))
+            ]
+            results = [future.result() for future in futures]
+        self._merge_shard_results(results)
+        return self
+
+    def _merge_shard_results(self, results):
+        results = [stats for stats in results if stats is not None]
+        if not results:
+            raise ValueError("Input data cannot be empty")
+        self._stats = functools.reduce(self._merge_stats, results)
+        self._update_params()
+
+    def _set_feature_names(self, X):
+        # The column order seen at fit is the plan used to read records by name,
+        # and the dtype the numeric fit input was converted to is the dtype of records.
+        if isinstance(X, pd.DataFrame):
+            self.feature_names_in_ = list(X.select_dtypes(include=[np.number]).columns)
+            self._fit_dtype = self._input_dtype(X[self.feature_names_in_])
+        else:
+            self.feature_names_in_ = None
+            self._fit_dtype = self._input_dtype(X)
+
+    def _fit_groups(self, X):
+        """
+        Group codes, number of groups and validated feature columns of ``X``
+        for a grouped fit; the group keys are stored in ``groups_``.
+        """
+        columns = group_columns(X, self.groupby)
+        codes, self.groups_ = factorize_groups(X, columns)
+        features = X.drop(columns=columns)
+        self._set_feature_names(features)
+        return codes, len(self.groups_), self._validate_data(features, copy=False)
 
-    def transform_csv(self, path):
-        X = self._read_csv(path)
-        return self.transform(X)
+    def _transform_groups(self, X, shift, scale, n_threads=None):
+        columns = group_columns(X, self.groupby)
+        codes = group_codes(X, columns, self.groups_)
+        out = self._validate_data(X.drop(columns=columns))
+        if out.shape[1] != shift.shape[1]:
+            raise ValueError(f"X has {out.shape[1]} features, but the scaler was fitted with {shift.shape[1]} features")
+        n_threads = _effective_n_jobs(n_threads)
+        if n_threads == 1 or out.size < MIN_THREADED_ELEMENTS:
+            return scale_groups(out, codes, shift, scale)
+        _run_in_blocks(lambda start, stop: scale_groups(out, codes, shift, scale, start, stop), len(out), n_threads)
+        return out
 
-    def fit_transform_csv(self, path):
-        X = self._read_csv(path)
-        return self.fit_transform(X)
+    def _check_not_grouped(self, operation):
+        if self.groupby is not None:
+            raise ValueError(f"{operation} is not available for a scaler with groupby.")
 
-    def _validate_data(self, X):
+    def _check_is_fitted(self):
+        if getattr(self, self._fitted_attribute, None) is None:
+            raise ValueError(f"{type(self).__name__} has not been fitted. Call 'fit' before using 'transform'.")
+
+    def _record_values(self, record):
+        if not isinstance(record, dict):
+            return record
+        if self.feature_names_in_ is None:
+            raise ValueError("Records can only be given as dicts when the scaler was fitted on a DataFrame; "
+                             "pass a sequence of feature values instead.")
+        try:
+            return [record[name] for name in self.feature_names_in_]
+        except KeyError as e:
+            raise ValueError(f"Record is missing the feature {e}")
+
+    def _record_dtype(self, records):
+        if isinstance(records, np.ndarray) or getattr(self, 'dtype', None) is not None:
+            return self._input_dtype(records)
+        return getattr(self, '_fit_dtype', None) or np.dtype(np.float64)
+
+    def _check_record_shape(self, X):
+        n_features = len(getattr(self, self._fitted_attribute))
+        if X.ndim != 2 or X.shape[1] != n_features:
+            raise ValueError(f"Records must have {n_features} features, got shape {X.shape}")
+
+    @instrumented
+    def transform_one(self, record):
+        """
+        Transform a single record with minimal overhead, for online inference.
+
+        ``record`` is a dict keyed by the column names seen at fit (extra keys
+        are ignored) or a sequence of feature values in fit order. Returns a
+        1-D array. The result is the same as transforming the record as a
+        one-row batch. An ndarray record keeps its dtype as in ``transform``;
+        other records take the dtype of the data the scaler was fitted on
+        (float32 after a float32 fit), unless the scaler has a ``dtype``.
+        """
+        self._check_is_fitted()
+        self._check_not_grouped('transform_one')
+        row = np.array(self._record_values(record), dtype=self._record_dtype(record), ndmin=2)
+        self._check_record_shape(row)
+        return self._transform_inplace(row)[0]
+
+    @instrumented
+    def transform_records(self, records):
+        """
+        Transform a list of records (dicts or sequences, as in ``transform_one``)
+        into a 2-D array, one row per record.
+        """
+        self._check_is_fitted()
+        self._check_not_grouped('transform_records')
+        if len(records) and isinstance(records[0], dict) and self.feature_names_in_ is not None:
+            getter = operator.itemgetter(*self.feature_names_in_)
+            try:
+                rows = [getter(record) for record in records]
+            except KeyError as e:
+                raise ValueError(f"Record is missing the feature {e}")
+            if len(self.feature_names_in_) == 1:
+                rows = [[value] for value in rows]
+        else:
+            rows = [self._record_values(record) for record in records]
+        X = np.array(rows, dtype=self._record_dtype(records), ndmin=2)
+        self._check_record_shape(X)
+        return self._transform_inplace(X)
+
+    @staticmethod
+    def _check_dtype(dtype):
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'f':
+            raise ValueError(f"dtype must be a floating point type, got {dtype}")
+        return dtype
+
+    def _transform(self, X, n_threads=None):
+        n_threads = _effective_n_jobs(n_threads)
+        if n_threads == 1 or np.size(X) < MIN_THREADED_ELEMENTS:
+            return self._transform_inplace(self._validate_for_transform(X))
+
+        if isinstance(X, np.ndarray) and X.ndim == 2 and getattr(self, 'copy', True):
+            order = 'F' if X.flags.f_contiguous else 'C'
+            out = np.empty(X.shape, dtype=self._input_dtype(X), order=order)
+
+            def transform_block(start, stop):
+                np.copyto(out[start:stop], X[start:stop], casting='unsafe')
+                self._transform_inplace(out[start:stop])
+        else:
+            out = self._validate_for_transform(X)
+
+            def transform_block(start, stop):
+                self._transform_inplace(out[start:stop])
+
+        _run_in_blocks(transform_block, out.shape[0], n_threads)
+        return out
+
+    def _validate_for_transform(self, X):
+        # Returns an array that the transform is free to overwrite.
+        inplace = (
+            not getattr(self, 'copy', True)
+            and isinstance(X, np.ndarray)
+            and X.ndim == 2
+            and X.dtype == self._input_dtype(X)
+            and X.flags.writeable
+            and (X.flags.c_contiguous or X.flags.f_contiguous)
+        )
+        return self._validate_data(X, copy=not inplace)
+
+    def _input_dtype(self, X):
+        # The scaler's dtype; with dtype=None, float32 when the values of X
+        # all fit in float32 without rounding and float64 otherwise.
+        dtype = getattr(self, 'dtype', None)
+        if dtype is not None:
+            return dtype
+        if isinstance(X, pd.DataFrame):
+            dtypes = [dtype for dtype in X.dtypes if isinstance(dtype, np.dtype)]
+            dtype = np.result_type(*dtypes) if dtypes and len(dtypes) == X.shape[1] else None
+        else:
+            dtype = getattr(X, 'dtype', None)
+        if dtype is not None and dtype.kind == 'f' and dtype.itemsize <= 4:
+            return np.dtype(np.float32)
+        return np.dtype(np.float64)
+
+    def _validate_data(self, X, copy=True):
         if isinstance(X, pd.DataFrame):
             numeric_columns = X.select_dtypes(include=[np.number]).columns
             if len(numeric_columns) == 0:
                 raise ValueError("No numeric columns found in the DataFrame")
             if len(numeric_columns) != len(X.columns):
                 print("WARNING! Not all columns in the DataFrame are numeric. Non-numeric columns will be skipped.")
-            arr = X[numeric_columns].to_numpy().astype('float64')
+                X = X[numeric_columns]
+            arr = X.to_numpy(dtype=self._input_dtype(X), copy=copy)
         elif isinstance(X, np.ndarray):
-            arr = X.astype('float64')
+            dtype = self._input_dtype(X)
+            arr = np.array(X, dtype=dtype, copy=True) if copy else np.asarray(X, dtype=dtype)
         else:
+            dtype = self._input_dtype(None)
             try:
-                arr = np.array(X).astype('float64')
+                arr = np.array(X, dtype=dtype)
             except ValueError:
-                raise ValueError("Input data must be convertible to a numpy array of float64")
+                raise ValueError(f"Input data must be convertible to a numpy array of {dtype}")
 
         if arr.size == 0:
             raise ValueError("Input data cannot be empty")
 
-        return arr
\ No newline at end of file
+        return arr
+
+
+def _import_plotting():
+    """
+    Import matplotlib and seaborn on first use, so that importing the package
+    does not pay for them. They are installed with the 'plot' extra.
+    """
+    try:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+    except ImportError:
+        raise ImportError("Plotting requires matplotlib and seaborn: pip install preprocessing_tools[plot]")
+    return plt, sns
+
+
+def _prefetch(iterable, size):
+    """
+    Iterate over ``iterable`` in a background thread that keeps at most
+    ``size`` items ready. Exceptions raised by the iterable are re-raised in
+    the consumer. With ``size`` < 1 the iterable is consumed inline.
+    """
+    if size < 1:
+        yield from iterable
+        return
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class _ChunkWriter:
+    """
+    Writes DataFrame chunks to a CSV or Parquet file, from a background
+    thread when ``size`` > 0 and inline otherwise.
+    """
+
+    def __init__(self, path, size):
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension not in ('.csv', '.parquet', '.pq'):
+            raise ValueError(f"Unsupported output format '{extension}'. Expected .csv, .parquet or .pq")
+        self.path = path
+        self.parquet = extension != '.csv'
+        self.file = None
+        self.writer = None
+        self.error = None
+        self.thread = None
+        if size > 0:
+            self.chunks = queue.Queue(maxsize=size)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self.writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=self.writer.schema, preserve_index=False)
+            self.writer.write_table(table)
+        elif self.file is None:
+            self.file = open(self.path, 'w', newline='')
+            chunk.to_csv(self.file, index=False)
+        else:
+            chunk.to_csv(self.file, index=False, header=False)
+
+    def _run(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            if self.error is None:
+                try:
+                    self._write(chunk)
+                except BaseException as e:
+                    # Keep draining so that put never blocks on a failed writer.
+                    self.error = e
+
+    def put(self, chunk):
+        if self.error is not None:
+            raise ValueError(f"Error writing {self.path}: {self.error}")
+        if self.thread is None:
+            try:
+                self._write(chunk)
+            except Exception as e:
+                self.error = e
+                raise ValueError(f"Error writing {self.path}: {e}")
+        else:
+            self.chunks.put(chunk)
+
+    def close(self, abort=False):
+        if self.thread is not None:
+            if abort:
+                self.error = self.error or RuntimeError("aborted")
+            self.chunks.put(None)
+            self.thread.join()
+        if self.writer is not None:
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+        if self.error is not None and not abort:
+            raise ValueError(f"Error writing {self.path}: {self.error}")
+
+
+def _row_blocks(X, block_elements=BLOCK_ELEMENTS):
+    """Yield consecutive row slices of ``X`` holding about ``block_elements`` values (1-D ``X`` is one column)."""
+    step = max(1, block_elements // max(1, X.shape[1] if X.ndim > 1 else 1))
+    for start in range(0, X.shape[0], step):
+        yield X[start:start + step]
+
+
+def _block_moments(X):
+    mask = ~np.isnan(X)
+    n = mask.sum(axis=0)
+    total = np.where(mask, X, 0).sum(axis=0, dtype='float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+    m2 = np.nansum((X - mean) ** 2, axis=0)
+    return n, mean, m2
+
+
+def _moments(X):
+    """Per-column non-NaN count, mean and sum of squared deviations of ``X``."""
+    # Row blocks keep the mask and deviation temporaries small.
+    return functools.reduce(_merge_moments, (_block_moments(block) for block in _row_blocks(X)))
+
+
+def _merge_moments(a, b):
+    """Combine two ``(n, mean, m2)`` tuples (Chan et al. parallel update)."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = mean_a + delta * (n_b / n)
+        m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+    # Columns that are still empty on one side take the other side as is.
+    mean = np.where(n_a == 0, mean_b, np.where(n_b == 0, mean_a, mean))
+    m2 = np.where(n_a == 0, m2_b, np.where(n_b == 0, m2_a, m2))
+    return n, mean, m2
+
+
+def _is_float_dtype(dtype) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind == 'f'
+
+
+def _run_in_blocks(fn, n, n_threads):
+    """
+    Call ``fn(start, stop)`` on ``n_threads`` contiguous ranges covering
+    ``range(n)``, on a thread pool.
+    """
+    n_threads = max(1, min(n_threads, n))
+    bounds = np.linspace(0, n, n_threads + 1).astype(int)
+    if n_threads == 1:
+        fn(0, n)
+        return
+    with ThreadPoolExecutor(n_threads) as pool:
+        for future in [pool.submit(fn, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]:
+            future.result()
+
+
+def _effective_n_jobs(n_jobs):
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    if n_jobs == 0:
+        raise ValueError("n_jobs cannot be 0")
+    return n_jobs
+
+
+def _shard_stats(stats_fn, shm_name, shape, dtype, start, stop):
+    """Worker for ``ScalerMixin._parallel_fit``: statistics of rows ``[start, stop)``."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        X = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        stats = stats_fn(X[start:stop])
+        del X
+        return stats
+    finally:
+        shm.close()
+
+
+def _csv_range_stats(path, start, stop, names, columns, stats_fn, merge_fn, dtype='float64',
+                     block_bytes=CSV_BLOCK_BYTES):
+    """Worker for ``ScalerMixin._parallel_fit_csv``: statistics of bytes ``[start, stop)``."""
+    stats = None
+    with open(path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        while pos < stop:
+            block = f.read(min(block_bytes, stop - pos))
+            pos += len(block)
+            if pos < stop and not block.endswith(b'\n'):
+                tail = f.readline()
+                pos += len(tail)
+                block += tail
+            try:
+                frame = pd.read_csv(io.BytesIO(block), header=None, names=names, usecols=columns)
+                X = frame[columns].to_numpy(dtype=dtype)
+            except Exception as e:
+                raise ValueError(f"Error reading CSV file: {str(e)}")
+            if X.shape[0] == 0:
+                continue
+            block_stats = stats_fn(X)
+            stats = block_stats if stats is None else merge_fn(stats, block_stats)
+    return stats
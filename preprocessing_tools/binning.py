@@ -1,7 +1,8 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from .dataEncoding import _smallest_int_dtype
+from ._utils import _import_plotting
+from .instrumentation import instrumented
 
 class Binning:
     def __init__(self, data: pd.DataFrame):
@@ -13,6 +14,7 @@ class Binning:
         """
         self.data = data
 
+    @instrumented
     def create_bins(self, column: str, bins: int or list, labels: list = None) -> pd.DataFrame:
         """
         Create bins for a specified column in the DataFrame.
@@ -46,6 +48,7 @@ class Binning:
         column (str): The binned column to plot.
         """
         try:
+            plt, sns = _import_plotting()
             plt.figure(figsize=(10, 6))
             sns.countplot(x=column, data=self.data)
             plt.title(f'Distribution of {column}')
@@ -55,6 +58,7 @@ class Binning:
         except Exception as e:
             print(f"An error occurred while plotting bins: {e}")
 
+    @instrumented
     def apply_binning(self, column: str, bins: int or list, labels: list = None, plot: bool = False) -> pd.DataFrame:
         """
         Apply binning to a specified column and optionally plot the distribution.
@@ -80,6 +84,193 @@ class Binning:
     - Handle plotting errors, such as when the specified column does not exist or is not binned.
     """
 
+
+def _kmeans_edges(x: np.ndarray, n_bins: int, max_iter: int = 100) -> np.ndarray:
+    """
+    Bin edges of a 1-D k-means on x: centres start at the midpoints of
+    uniform bins and the edges are the midpoints between sorted centres.
+    """
+    lo, hi = x.min(), x.max()
+    uniform = np.linspace(lo, hi, n_bins + 1)
+    centers = (uniform[1:] + uniform[:-1]) / 2
+    for _ in range(max_iter):
+        labels = np.searchsorted((centers[1:] + centers[:-1]) / 2, x)
+        counts = np.bincount(labels, minlength=n_bins)
+        sums = np.bincount(labels, weights=x, minlength=n_bins)
+        updated = np.sort(np.where(counts > 0, sums / np.maximum(counts, 1), centers))
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+    return np.concatenate([[lo], (centers[1:] + centers[:-1]) / 2, [hi]])
+
+
+class Binner:
+    """
+    Binner that learns bin edges for many columns at fit time and applies the
+    stored edges unchanged to new data.
+
+    A value x falls into bin i when edges[i] <= x < edges[i + 1]; values
+    below the first or above the last edge go to the first or last bin, and
+    missing values get the code -1. Codes are stored in the smallest integer
+    dtype that holds them (int8 for up to 127 bins).
+    """
+
+    def __init__(self, n_bins: int = 5, strategy: str = 'quantile', columns: list = None,
+                 quantile_method: str = 'exact', sketch_k: int = 200, random_state=None):
+        """
+        Initialize the Binner.
+
+        Parameters:
+        n_bins (int): The number of bins per column.
+        strategy (str): 'uniform' (equal width), 'quantile' (equal frequency) or 'kmeans' (1-D k-means clusters).
+        columns (list, optional): The columns to bin (labels, or positions for arrays). Defaults to every numeric column.
+        quantile_method (str): 'exact' or 'sketch'. 'sketch' learns quantiles with a bounded-memory
+                               QuantileSketch per column and supports partial_fit.
+        sketch_k (int): Accuracy parameter of the quantile sketches.
+        random_state (int, optional): Seed for the quantile sketches.
+        """
+        if n_bins < 2:
+            raise ValueError("n_bins must be at least 2")
+        if strategy not in ('uniform', 'quantile', 'kmeans'):
+            raise ValueError("strategy must be 'uniform', 'quantile' or 'kmeans'")
+        if quantile_method not in ('exact', 'sketch'):
+            raise ValueError("quantile_method must be 'exact' or 'sketch'")
+        self.n_bins = n_bins
+        self.strategy = strategy
+        self.columns = columns
+        self.quantile_method = quantile_method
+        self.sketch_k = sketch_k
+        self.random_state = random_state
+        self._reset()
+
+    def _reset(self):
+        self.columns_ = None
+        self.edges_ = None
+        self._stats = None
+        self._rng = np.random.default_rng(self.random_state)
+
+    def _select(self, data) -> np.ndarray:
+        if isinstance(data, pd.DataFrame):
+            if self.columns_ is None:
+                self.columns_ = list(self.columns) if self.columns is not None else \
+                    list(data.select_dtypes(include=[np.number]).columns)
+            missing = [column for column in self.columns_ if column not in data.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+            return data[self.columns_].to_numpy(dtype='float64')
+        data = np.asarray(data, dtype='float64')
+        if data.ndim != 2:
+            raise ValueError("Input array must be 2-dimensional.")
+        if self.columns_ is None:
+            self.columns_ = list(self.columns) if self.columns is not None else list(range(data.shape[1]))
+        return data[:, self.columns_]
+
+    def _supports_partial_fit(self) -> bool:
+        return self.strategy == 'uniform' or (self.strategy == 'quantile' and self.quantile_method == 'sketch')
+
+    @instrumented
+    def fit(self, data):
+        """
+        Learn the bin edges of every column.
+
+        Parameters:
+        data (pd.DataFrame or np.ndarray): The training data.
+
+        Returns:
+        Binner: The fitted binner.
+        """
+        self._reset()
+        X = self._select(data)
+        empty = [column for column, observed in zip(self.columns_, (~np.isnan(X)).any(axis=0)) if not observed]
+        if empty:
+            raise ValueError(f"Columns {empty} have no non-missing values to learn bin edges from.")
+        if self._supports_partial_fit():
+            return self._update(X)
+        if self.strategy == 'quantile':
+            quantiles = np.nanquantile(X, np.linspace(0, 1, self.n_bins + 1), axis=0)
+            self._set_edges(quantiles.T)
+        else:
+            self._set_edges([_kmeans_edges(column[~np.isnan(column)], self.n_bins) for column in X.T])
+        return self
+
+    @instrumented
+    def partial_fit(self, data):
+        """
+        Update the bin edges with another batch ('uniform', or 'quantile' with quantile_method='sketch').
+
+        Parameters:
+        data (pd.DataFrame or np.ndarray): The next batch of training data.
+
+        Returns:
+        Binner: The fitted binner.
+        """
+        if not self._supports_partial_fit():
+            raise ValueError("partial_fit is only available for strategy='uniform' and for "
+                             "strategy='quantile' with quantile_method='sketch'")
+        X = self._select(data)
+        if len(X) == 0:
+            # Empty batches leave the edges unchanged.
+            return self
+        return self._update(X)
+
+    def _update(self, X):
+        from ._sketch import QuantileSketch
+
+        if self.strategy == 'uniform':
+            stats = (np.nanmin(X, axis=0), np.nanmax(X, axis=0))
+            if self._stats is not None:
+                stats = (np.fmin(self._stats[0], stats[0]), np.fmax(self._stats[1], stats[1]))
+            self._stats = stats
+            self._set_edges(np.linspace(stats[0], stats[1], self.n_bins + 1).T)
+            return self
+        if self._stats is None:
+            self._stats = [QuantileSketch(self.sketch_k, self._rng) for _ in self.columns_]
+        for sketch, column in zip(self._stats, X.T):
+            sketch.update(column)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)
+        self._set_edges([sketch.quantile(quantiles) for sketch in self._stats])
+        return self
+
+    def _set_edges(self, edges):
+        # Repeated edges (ties in the quantiles, constant columns) would make
+        # empty bins, so they are dropped.
+        self.edges_ = {column: np.unique(column_edges) for column, column_edges in zip(self.columns_, edges)}
+        self.n_bins_ = {column: max(len(column_edges) - 1, 1) for column, column_edges in self.edges_.items()}
+
+    @instrumented
+    def transform(self, data):
+        """
+        Replace every binned column by its bin codes using the stored edges.
+
+        Parameters:
+        data (pd.DataFrame or np.ndarray): The data to bin.
+
+        Returns:
+        pd.DataFrame: A copy of the DataFrame with the binned columns replaced by their codes
+                      (the input is not modified), or an np.ndarray of codes with one column
+                      per binned column for array input.
+        """
+        if self.edges_ is None:
+            raise ValueError("Binner has not been fitted. Call 'fit' before using 'transform'.")
+        # Column-major layout keeps every searched column contiguous.
+        X = np.asfortranarray(self._select(data))
+        dtype = _smallest_int_dtype(-1, max(self.n_bins_.values()) - 1)
+        codes = np.empty(X.shape, dtype=dtype, order='F')
+        for j, column in enumerate(self.columns_):
+            codes[:, j] = np.searchsorted(self.edges_[column][1:-1], X[:, j], side='right')
+        # searchsorted puts NaN after every edge.
+        codes[np.isnan(X)] = -1
+        if not isinstance(data, pd.DataFrame):
+            return codes
+        binned = data.copy(deep=False)
+        for j, column in enumerate(self.columns_):
+            binned[column] = codes[:, j]
+        return binned
+
+    @instrumented
+    def fit_transform(self, data):
+        return self.fit(data).transform(data)
+
 """
 def test_binning():
     # Create a small demo dataframe
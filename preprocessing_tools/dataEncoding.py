@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
+from .instrumentation import instrumented
 
 class DataEncoding:
 
     
+    @instrumented
     def label_encode(self, data: pd.DataFrame, columns: list) -> pd.DataFrame: 
         
         if not isinstance(data, pd.DataFrame):
@@ -16,16 +19,21 @@ class DataEncoding:
         return data
     
 
-    def one_hot_encode(self, data: pd.DataFrame, columns: list) -> pd.DataFrame:
+    @instrumented
+    def one_hot_encode(self, data: pd.DataFrame, columns: list, sparse: bool = False,
+                       dtype='uint8') -> pd.DataFrame:
         if not isinstance(data, pd.DataFrame):
             raise ValueError("Input data must be a pandas DataFrame.")
     
-        data = pd.get_dummies(data, columns=columns)
-        data = data.astype(int)
+        # Only the new indicator columns are created, as one-byte integers by
+        # default; the columns that are not encoded are neither cast nor
+        # copied a second time.
+        data = pd.get_dummies(data, columns=columns, dtype=dtype, sparse=sparse)
     
         return data
 
 
+    @instrumented
     def ordinal_encode(self, data: pd.DataFrame, columns: list, categories: dict) -> pd.DataFrame:
         
         if not isinstance(data, pd.DataFrame):
@@ -37,7 +45,261 @@ class DataEncoding:
             if column not in categories:
                 raise ValueError(f"Categories for column '{column}' must be provided.")
             
-            category_mapping = {category: index for index, category in enumerate(categories[column])}
-            data[column] = data[column].map(category_mapping)
+            index = pd.Index(categories[column])
+            if not index.is_unique:
+                category_mapping = {category: index for index, category in enumerate(categories[column])}
+                data[column] = data[column].map(category_mapping)
+                continue
+            # Hash lookup over the whole column; values that are not listed
+            # become NaN exactly as with Series.map.
+            codes = index.get_indexer(data[column])
+            data[column] = np.where(codes < 0, np.nan, codes) if (codes < 0).any() else codes
         
         return data
+
+
+class OneHotEncoder:
+    """
+    One-hot encoder that learns the category vocabulary of each column at fit
+    time and applies it unchanged to later data.
+
+    The default output is a scipy CSR matrix holding only the indicator
+    columns, so memory grows with the number of rows rather than with rows x
+    categories. Rare levels can be folded into a single '<column>_other'
+    indicator with ``min_frequency`` and ``max_categories``. Missing values
+    encode as all zeros (as ``pd.get_dummies``); values not seen during fit
+    go to the 'other' indicator when there is one and encode as all zeros
+    otherwise.
+
+    Parameters
+    ----------
+    columns : list
+        The columns to encode.
+    output : str
+        'csr' for a scipy.sparse CSR matrix of the indicator columns,
+        'sparse_frame' for the input DataFrame with the encoded columns
+        replaced by pandas sparse indicator columns, or 'frame' for the same
+        with dense indicator columns.
+    min_frequency : int or float, optional
+        Levels seen fewer times than this (a count, or a fraction of the rows
+        when a float below 1) are folded into 'other'.
+    max_categories : int, optional
+        Maximum number of indicator columns per encoded column, including
+        'other'. The most frequent levels are kept.
+    dtype : str or np.dtype
+        Dtype of the indicator values.
+    """
+
+    def __init__(self, columns: list, output: str = 'csr', min_frequency=None, max_categories: int = None,
+                 dtype='uint8'):
+        if output not in ('csr', 'sparse_frame', 'frame'):
+            raise ValueError("output must be 'csr', 'sparse_frame' or 'frame'")
+        if max_categories is not None and max_categories < 2:
+            raise ValueError("max_categories must be at least 2")
+        self.columns = list(columns)
+        self.output = output
+        self.min_frequency = min_frequency
+        self.max_categories = max_categories
+        self.dtype = np.dtype(dtype)
+        self.categories_ = None
+        self.has_other_ = None
+
+    @instrumented
+    def fit(self, data: pd.DataFrame):
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        self.categories_ = {}
+        self.has_other_ = {}
+        for column in self.columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' is not in the DataFrame.")
+            counts = data[column].value_counts(dropna=True)
+            keep = counts
+            if self.min_frequency is not None:
+                threshold = self.min_frequency
+                if isinstance(threshold, float) and threshold < 1:
+                    threshold = threshold * len(data)
+                keep = keep[keep >= threshold]
+            # 'other' counts towards max_categories whenever it exists, either
+            # because min_frequency folded some levels or because of the cap.
+            if self.max_categories is not None and (len(keep) < len(counts) or len(keep) > self.max_categories):
+                keep = keep.iloc[:self.max_categories - 1]
+            self.categories_[column] = pd.Index(keep.index).sort_values()
+            self.has_other_[column] = len(keep) < len(counts)
+        return self
+
+    def get_feature_names_out(self) -> list:
+        if self.categories_ is None:
+            raise ValueError("OneHotEncoder has not been fitted. Call 'fit' before using 'transform'.")
+        names = []
+        for column in self.columns:
+            names.extend(f'{column}_{category}' for category in self.categories_[column])
+            if self.has_other_[column]:
+                names.append(f'{column}_other')
+        return names
+
+    def _encode(self, data: pd.DataFrame):
+        # Output column of every row for every encoded column (-1 for none).
+        indices = np.empty((len(data), len(self.columns)), dtype=np.int64)
+        offset = 0
+        for j, column in enumerate(self.columns):
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' is not in the DataFrame.")
+            categories = self.categories_[column]
+            codes = pd.Categorical(data[column], categories=categories).codes.astype(np.int64)
+            if self.has_other_[column]:
+                codes[(codes < 0) & data[column].notna().to_numpy()] = len(categories)
+            indices[:, j] = np.where(codes >= 0, codes + offset, -1)
+            offset += len(categories) + self.has_other_[column]
+        return indices, offset
+
+    def _to_csr(self, indices, width):
+        from scipy import sparse
+
+        valid = indices >= 0
+        indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        # Offsets grow with the column position, so row-major order keeps
+        # every row's indices sorted.
+        columns = indices[valid]
+        values = np.ones(len(columns), dtype=self.dtype)
+        return sparse.csr_matrix((values, columns, indptr), shape=(len(indices), width))
+
+    @instrumented
+    def transform(self, data: pd.DataFrame):
+        if self.categories_ is None:
+            raise ValueError("OneHotEncoder has not been fitted. Call 'fit' before using 'transform'.")
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        indices, width = self._encode(data)
+        names = self.get_feature_names_out()
+        if self.output == 'csr':
+            return self._to_csr(indices, width)
+
+        if self.output == 'sparse_frame':
+            dummies = pd.DataFrame.sparse.from_spmatrix(self._to_csr(indices, width), index=data.index, columns=names)
+        else:
+            values = np.zeros((len(data), width), dtype=self.dtype)
+            rows, positions = np.nonzero(indices >= 0)
+            values[rows, indices[rows, positions]] = 1
+            dummies = pd.DataFrame(values, index=data.index, columns=names, copy=False)
+        return pd.concat([data.drop(columns=self.columns), dummies], axis=1)
+
+    @instrumented
+    def fit_transform(self, data: pd.DataFrame):
+        return self.fit(data).transform(data)
+
+
+def _smallest_int_dtype(low: int, high: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class LabelEncoder:
+    """
+    Label encoder that learns the categories of each column once, at fit
+    time, so the same value always gets the same code in later batches.
+
+    Codes follow the sorted categories, as ``DataEncoding.label_encode``.
+    Lookups go through ``pd.Categorical`` with the stored categories (one
+    vectorized hash lookup per column) and are stored in the smallest
+    integer dtype that holds every code. Missing values encode as -1 and
+    values not seen during fit as ``unknown_value`` (-2 by default), so the
+    two can be told apart.
+
+    Parameters
+    ----------
+    columns : list
+        The columns to encode.
+    unknown_value : int
+        Code for values that were not seen during fit. It must not be the
+        code of a category, i.e. be negative or at least the number of
+        categories of every column.
+    """
+
+    def __init__(self, columns: list, unknown_value: int = -2):
+        self.columns = list(columns)
+        self.unknown_value = unknown_value
+        self.categories_ = None
+
+    def _check_columns(self, data: pd.DataFrame):
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        for column in self.columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' is not in the DataFrame.")
+
+    @instrumented
+    def fit(self, data: pd.DataFrame):
+        self._check_columns(data)
+        self.categories_ = {column: data[column].astype('category').cat.categories for column in self.columns}
+        return self
+
+    def _encode_column(self, values: pd.Series, categories: pd.Index) -> np.ndarray:
+        if 0 <= self.unknown_value < len(categories):
+            raise ValueError(f"unknown_value {self.unknown_value} is the code of category "
+                             f"'{categories[self.unknown_value]}' of column '{values.name}'.")
+        codes = pd.Categorical(values, categories=categories).codes
+        dtype = _smallest_int_dtype(min(-1, self.unknown_value), max(len(categories) - 1, self.unknown_value))
+        if self.unknown_value == -1:
+            return codes.astype(dtype, copy=False)
+        codes = codes.astype(dtype)
+        codes[(codes == -1) & values.notna().to_numpy()] = self.unknown_value
+        return codes
+
+    @instrumented
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return a copy of ``data`` with the encoded columns replaced by their
+        codes; the input frame is not modified.
+        """
+        if self.categories_ is None:
+            raise ValueError(f"{type(self).__name__} has not been fitted. Call 'fit' before using 'transform'.")
+        self._check_columns(data)
+        # A shallow copy shares the untouched columns with the input.
+        encoded = data.copy(deep=False)
+        for column in self.columns:
+            encoded[column] = self._encode_column(data[column], self.categories_[column])
+        return encoded
+
+    @instrumented
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(data).transform(data)
+
+
+class OrdinalEncoder(LabelEncoder):
+    """
+    Ordinal encoder with a user-given category order per column, encoded
+    through the same vectorized lookup as ``LabelEncoder``. Unlike
+    ``DataEncoding.ordinal_encode``, values missing from the order get the
+    explicit ``unknown_value`` code instead of NaN.
+
+    Parameters
+    ----------
+    columns : list
+        The columns to encode.
+    categories : dict
+        Ordered list of categories for every column.
+    unknown_value : int
+        Code for values that are not listed in ``categories`` (see ``LabelEncoder``).
+    """
+
+    def __init__(self, columns: list, categories: dict, unknown_value: int = -2):
+        super().__init__(columns, unknown_value)
+        for column in self.columns:
+            if column not in categories:
+                raise ValueError(f"Categories for column '{column}' must be provided.")
+        self.categories = categories
+
+    @instrumented
+    def fit(self, data: pd.DataFrame = None):
+        if data is not None:
+            self._check_columns(data)
+        self.categories_ = {column: pd.Index(self.categories[column]) for column in self.columns}
+        for column, index in self.categories_.items():
+            if not index.is_unique:
+                raise ValueError(f"Categories for column '{column}' must be unique.")
+        return self
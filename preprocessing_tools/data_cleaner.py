@@ -1,6 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
-from sklearn.impute import KNNImputer
+from .instrumentation import instrumented
+from ._utils import _effective_n_jobs, _is_float_dtype
+
+# Distances computed at a time by the 'blocked' KNN imputation (query rows x reference rows).
+KNN_BLOCK_DISTANCES = 1 << 22
+
 
 class DataCleaner:
     def __init__(self, dataframe):
@@ -8,6 +15,7 @@ class DataCleaner:
             raise TypeError("dataframe should be a pandas Dataframe")
         self.dataframe = dataframe
 
+    @instrumented
     def remove_col_or_row(self, axis=0, thresh=None):
         """
         Remove columns or rows with missing values.
@@ -21,6 +29,7 @@ class DataCleaner:
         self.dataframe = self.dataframe.dropna(axis=axis, thresh=thresh)
         return self.dataframe
 
+    @instrumented
     def fill_with_zeros(self):
         """
         Fill missing values with zeros.
@@ -28,6 +37,7 @@ class DataCleaner:
         self.dataframe = self.dataframe.fillna(0)
         return self.dataframe
 
+    @instrumented
     def fill_with_mean(self):
         """
         Fill missing values with the mean of the column.
@@ -36,10 +46,252 @@ class DataCleaner:
         self.dataframe = self.dataframe.fillna(mean)
         return self.dataframe
 
-    def fill_with_knn(self, n_neighbors=2):
+    @instrumented
+    def fill_with_knn(self, n_neighbors=2, method='sklearn', max_reference=None, block_rows=None,
+                      n_jobs=None, random_state=None):
         """
-        Fill missing values using K-Nearest Neighbors (KNN) imputation
+        Fill missing values using K-Nearest Neighbors (KNN) imputation.
+        method: 'sklearn' runs sklearn's KNNImputer on the whole frame and returns an ndarray.
+                'blocked' only searches neighbors for the rows that have missing values, among the
+                complete rows, and returns a DataFrame with the original index and columns.
+        max_reference: ('blocked' only) number of complete rows sampled as the reference set; all complete rows by default.
+        block_rows: ('blocked' only) number of rows queried at once; chosen so that a block of distances
+                    holds about 4M values when omitted, which bounds the memory of the search.
+        n_jobs: ('blocked' only) number of threads for the query blocks (-1 for all CPUs).
+        random_state: ('blocked' only) seed for the reference sample.
         """
-        imputer = KNNImputer(missing_values=np.nan, n_neighbors=n_neighbors)
-        self.dataframe = imputer.fit_transform(self.dataframe)
+        if method == 'sklearn':
+            from sklearn.impute import KNNImputer
+
+            imputer = KNNImputer(missing_values=np.nan, n_neighbors=n_neighbors)
+            self.dataframe = imputer.fit_transform(self.dataframe)
+            return self.dataframe
+        if method != 'blocked':
+            raise ValueError("method must be 'sklearn' or 'blocked'")
+        self.dataframe = self._fill_with_knn_blocked(n_neighbors, max_reference, block_rows, n_jobs, random_state)
         return self.dataframe
+
+    def _fill_with_knn_blocked(self, n_neighbors, max_reference, block_rows, n_jobs, random_state):
+        numeric = self.dataframe.select_dtypes(include=[np.number]).columns
+        X = self.dataframe[numeric].to_numpy(dtype='float64', copy=True)
+        missing = np.isnan(X)
+        incomplete = np.flatnonzero(missing.any(axis=1))
+        if incomplete.size == 0:
+            return self.dataframe.copy()
+
+        reference = X[~missing.any(axis=1)]
+        if len(reference) == 0:
+            raise ValueError("fill_with_knn needs at least one row without missing values")
+        if max_reference is not None and len(reference) > max_reference:
+            rng = np.random.default_rng(random_state)
+            reference = reference[np.sort(rng.choice(len(reference), max_reference, replace=False))]
+        k = min(n_neighbors, len(reference))
+        if block_rows is None:
+            block_rows = max(1, KNN_BLOCK_DISTANCES // len(reference))
+
+        # Squared distance over the observed columns of a query row a (mask o)
+        # to a reference row b, for every missing pattern at once:
+        #   sum(o * a**2) - 2 * (o * a) . b + o . b**2
+        # The first term is the same for every candidate of a row and does not
+        # change which are nearest, so the ranking needs one matrix product
+        # per block of queries: [o, -2 * o * a] @ [b**2, b].T. Every reference
+        # row is complete, so the nearest ones are also the donors, and the
+        # nan-euclidean ordering used by KNNImputer reduces to this one.
+        # Distances do not change when every column is shifted, so columns are
+        # centred on the reference means first: with large offsets, b**2 and
+        # a . b would otherwise cancel and lose the precision of the ranking.
+        means = reference.mean(axis=0)
+        centred = reference - means
+        stacked_reference = np.ascontiguousarray(np.hstack([centred * centred, centred]).T)
+        observed = ~missing[incomplete]
+        stacked_queries = np.hstack([observed, np.where(observed, -2.0 * (X[incomplete] - means), 0.0)])
+        filled = X[incomplete]
+
+        def fill_block(start, stop):
+            distances = stacked_queries[start:stop] @ stacked_reference
+            if k < len(reference):
+                neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            else:
+                neighbors = np.broadcast_to(np.arange(k), (stop - start, k))
+            donors = reference[neighbors].mean(axis=1)
+            # Rows with nothing observed are filled with the reference means.
+            donors[~observed[start:stop].any(axis=1)] = means
+            block = filled[start:stop]
+            np.copyto(block, donors, where=np.isnan(block))
+
+        bounds = range(0, len(incomplete), block_rows)
+        n_jobs = _effective_n_jobs(n_jobs)
+        if n_jobs == 1:
+            for start in bounds:
+                fill_block(start, min(start + block_rows, len(incomplete)))
+        else:
+            with ThreadPoolExecutor(n_jobs) as pool:
+                for future in [pool.submit(fill_block, start, min(start + block_rows, len(incomplete)))
+                               for start in bounds]:
+                    future.result()
+
+        X[incomplete] = filled
+        dataframe = self.dataframe.copy()
+        dataframe[numeric] = X
+        return dataframe
+
+
+def _merge_counts(counts, new, max_counters):
+    """
+    Misra-Gries merge of two value -> count summaries. Keeps the
+    max_counters most frequent values; every kept count is underestimated by
+    at most n / (max_counters + 1), so any value that makes up more than that
+    share of the data is never dropped.
+    """
+    for value, count in new.items():
+        counts[value] = counts.get(value, 0) + count
+    if len(counts) > max_counters:
+        kept = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        cut = kept[max_counters][1]
+        counts = {value: count - cut for value, count in kept[:max_counters]}
+    return counts
+
+
+class SimpleImputer:
+    """
+    Imputer that learns one fill value per column at fit time and applies it
+    to later batches, so serving data is filled with the training statistics.
+
+    Statistics are accumulated chunk by chunk with partial_fit and take a
+    fixed amount of memory whatever the number of rows:
+        'mean': running sum and count.
+        'median': a QuantileSketch per column, exact while a column has at most
+                  sketch_k non-missing values. fit computes the exact median of
+                  its batch and only later partial_fit calls use the sketch.
+        'most_frequent': a Misra-Gries summary of at most max_counters values
+                         per column (exact while a column has no more distinct values).
+        'constant': fill_value, nothing is learned.
+    """
+
+    def __init__(self, strategy='mean', fill_value=None, columns=None, sketch_k=200, max_counters=1000,
+                 random_state=None):
+        """
+        strategy: 'mean', 'median', 'most_frequent' or 'constant'.
+        fill_value: value used by the 'constant' strategy.
+        columns: columns to impute (labels, or positions for arrays). Defaults to every numeric column,
+                 or every column for 'most_frequent' and 'constant'.
+        sketch_k: accuracy parameter of the median sketches.
+        max_counters: number of values tracked per column by 'most_frequent'.
+        random_state: seed for the median sketches.
+        """
+        if strategy not in ('mean', 'median', 'most_frequent', 'constant'):
+            raise ValueError("strategy must be 'mean', 'median', 'most_frequent' or 'constant'")
+        if strategy == 'constant' and fill_value is None:
+            raise ValueError("fill_value must be given for the 'constant' strategy")
+        self.strategy = strategy
+        self.fill_value = fill_value
+        self.columns = columns
+        self.sketch_k = sketch_k
+        self.max_counters = max_counters
+        self.random_state = random_state
+        self._reset()
+
+    def _reset(self):
+        self.columns_ = None
+        self.statistics_ = None
+        self._stats = None
+        self._rng = np.random.default_rng(self.random_state)
+
+    def _select(self, data):
+        if isinstance(data, pd.DataFrame):
+            if self.columns_ is None:
+                if self.columns is not None:
+                    self.columns_ = list(self.columns)
+                elif self.strategy in ('mean', 'median'):
+                    self.columns_ = list(data.select_dtypes(include=[np.number]).columns)
+                else:
+                    self.columns_ = list(data.columns)
+            missing = [column for column in self.columns_ if column not in data.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+            return [data[column] for column in self.columns_]
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError("Input array must be 2-dimensional.")
+        if self.columns_ is None:
+            self.columns_ = list(self.columns) if self.columns is not None else list(range(data.shape[1]))
+        return [pd.Series(data[:, column]) for column in self.columns_]
+
+    @instrumented
+    def fit(self, data):
+        self._reset()
+        self.partial_fit(data)
+        if self.strategy == 'median':
+            # The whole batch is at hand, so its medians are computed exactly;
+            # the sketches are kept for later partial_fit calls.
+            self.statistics_ = {column: s.astype('float64').median()
+                                for column, s in zip(self.columns_, self._select(data))}
+        return self
+
+    @instrumented
+    def partial_fit(self, data):
+        from ._sketch import QuantileSketch
+
+        series = self._select(data)
+        if self.strategy == 'mean':
+            values = np.column_stack([s.to_numpy(dtype='float64') for s in series])
+            stats = (np.sum(~np.isnan(values), axis=0), np.nansum(values, axis=0))
+            self._stats = stats if self._stats is None else (self._stats[0] + stats[0], self._stats[1] + stats[1])
+        elif self.strategy == 'median':
+            if self._stats is None:
+                self._stats = [QuantileSketch(self.sketch_k, self._rng) for _ in self.columns_]
+            for sketch, s in zip(self._stats, series):
+                sketch.update(s.to_numpy(dtype='float64'))
+        elif self.strategy == 'most_frequent':
+            if self._stats is None:
+                self._stats = [{} for _ in self.columns_]
+            self._stats = [_merge_counts(counts, s.value_counts(dropna=True).to_dict(), self.max_counters)
+                           for counts, s in zip(self._stats, series)]
+        else:
+            self._stats = ()
+        self._update_statistics()
+        return self
+
+    def _update_statistics(self):
+        if self.strategy == 'mean':
+            count, total = self._stats
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = total / count
+        elif self.strategy == 'median':
+            values = [float(sketch.quantile(0.5)) for sketch in self._stats]
+        elif self.strategy == 'most_frequent':
+            values = [max(counts, key=counts.get) if counts else np.nan for counts in self._stats]
+        else:
+            values = [self.fill_value] * len(self.columns_)
+        self.statistics_ = dict(zip(self.columns_, values))
+
+    @instrumented
+    def transform(self, data):
+        """
+        Return a copy of data with the missing values of every imputed column
+        replaced by its learned statistic; the input is not modified.
+        """
+        if self.statistics_ is None:
+            raise ValueError("SimpleImputer has not been fitted. Call 'fit' before using 'transform'.")
+        if isinstance(data, pd.DataFrame):
+            missing = [column for column in self.columns_ if column not in data.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+            # Float columns keep their precision: the statistic is rounded to
+            # the column's dtype instead of upcasting the column to float64.
+            fill = {column: data[column].dtype.type(value)
+                    if _is_float_dtype(data[column].dtype) and isinstance(value, float) else value
+                    for column, value in self.statistics_.items()}
+            return data.fillna(fill)
+        data = np.asarray(data)
+        fill = np.array([self.statistics_[column] for column in self.columns_])
+        dtype = data.dtype if _is_float_dtype(data.dtype) else np.result_type(data.dtype, fill.dtype)
+        data = np.array(data, dtype=dtype)
+        block = data[:, self.columns_]
+        mask = pd.isna(block)
+        data[:, self.columns_] = np.where(mask, fill, block)
+        return data
+
+    @instrumented
+    def fit_transform(self, data):
+        return self.fit(data).transform(data)
@@ -1,7 +1,12 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from ._sketch import QuantileSketch
+from ._groups import factorize_groups, group_columns, group_moments, group_quantiles
+from ._utils import _moments, _merge_moments, _import_plotting, _is_float_dtype
+from .instrumentation import instrumented
+
+# Scales the median absolute deviation to the standard deviation of a normal distribution.
+MAD_SCALE = 1.4826
 
 
 class HandlingOutliers:
@@ -20,6 +25,13 @@ class HandlingOutliers:
 
     IQR(column: str, plot: bool = False) -> pd.DataFrame:
         Removes outliers from the specified column using the IQR method.
+
+    inlier_mask(columns: list, method: str = 'z_score', ..., groupby=None) -> np.ndarray:
+        Boolean mask of the rows that are within bounds in every one of the columns
+        (of their group, with groupby).
+
+    remove_outliers(columns: list, method: str = 'z_score', ..., groupby=None) -> pd.DataFrame:
+        Removes outliers from many columns at once.
     """
 
     def __init__(self, dataFrame):
@@ -35,6 +47,7 @@ class HandlingOutliers:
             raise TypeError("dataFrame should be a pandas DataFrame")
         self.dataFrame = dataFrame
 
+    @instrumented
     def z_score(self, column_name: str, threshold_value: tuple, plot: bool = False) -> pd.DataFrame:
         """
         Removes outliers from the specified column using the z-score method.
@@ -69,21 +82,16 @@ class HandlingOutliers:
             mean_val = self.dataFrame[column_name].mean()
             std_val = self.dataFrame[column_name].std()
 
-            # Calculate the z-scores manually
-            self.dataFrame['z_score'] = (self.dataFrame[column_name] - mean_val) / std_val
+            # Calculate the z-scores manually, without adding a column to the caller's DataFrame
+            z_score = (self.dataFrame[column_name] - mean_val) / std_val
 
             # Filter the DataFrame to remove outliers
-            cleaned_df = self.dataFrame[
-                (self.dataFrame['z_score'] >= lower_threshold) & (self.dataFrame['z_score'] <= upper_threshold)]
-            outliers_df = self.dataFrame[
-                (self.dataFrame['z_score'] < lower_threshold) | (self.dataFrame['z_score'] > upper_threshold)]
-
-            # Drop the z_score column as it's no longer needed
-            cleaned_df = cleaned_df.drop(columns=['z_score'])
-            outliers_df = outliers_df.drop(columns=['z_score'])
+            cleaned_df = self.dataFrame[(z_score >= lower_threshold) & (z_score <= upper_threshold)]
+            outliers_df = self.dataFrame[(z_score < lower_threshold) | (z_score > upper_threshold)]
 
             # Plotting if requested
             if plot:
+                plt, sns = _import_plotting()
                 fig, ax = plt.subplots(2, 1, figsize=(10, 12))
 
                 # Plot the cleaned data
@@ -108,6 +116,7 @@ class HandlingOutliers:
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    @instrumented
     def IQR(self, column: str, plot: bool = False) -> pd.DataFrame:
         """
         Removes outliers from the specified column using the IQR method.
@@ -138,6 +147,7 @@ class HandlingOutliers:
                 (self.dataFrame[column] >= lower_bound) & (self.dataFrame[column] <= upper_bound)]
 
             if plot:
+                plt, sns = _import_plotting()
                 sns.boxplot(data=self.dataFrame[column])
                 plt.title(f'Box plot of {column} (Original Data)')
                 plt.show()
@@ -148,4 +158,321 @@ class HandlingOutliers:
             return cleaned_data
 
         except Exception as e:
-            print(f"An error occurred: {e}")
\ No newline at end of file
+            print(f"An error occurred: {e}")
+
+    @staticmethod
+    def _check_method(method: str, threshold_value: tuple):
+        """
+        Validates the method and, for 'z_score', the thresholds, before any statistic is computed.
+        """
+        if method not in ('z_score', 'IQR'):
+            raise ValueError("method must be 'z_score' or 'IQR'")
+        if method == 'z_score':
+            if not isinstance(threshold_value, tuple) or len(threshold_value) != 2:
+                raise ValueError("Threshold values should be a tuple containing exactly two values.")
+            if not all(isinstance(val, (int, float)) for val in threshold_value):
+                raise TypeError("Both threshold values should be numeric (int or float).")
+
+    def _bounds(self, X: np.ndarray, method: str, threshold_value: tuple, factor: float):
+        """
+        Per-column transform and bounds: a row is kept when lower <= (x - center) / scale <= upper.
+        """
+        self._check_method(method, threshold_value)
+        if method == 'z_score':
+            # Same statistics as pandas' Series.mean() and Series.std() (ddof=1).
+            center = np.nanmean(X, axis=0)
+            scale = np.nanstd(X, axis=0, ddof=1)
+            return center, scale, threshold_value[0], threshold_value[1]
+        Q1, Q3 = np.nanpercentile(X, [25, 75], axis=0)
+        IQR = Q3 - Q1
+        return 0.0, 1.0, Q1 - factor * IQR, Q3 + factor * IQR
+
+    def _group_bounds(self, X: np.ndarray, codes: np.ndarray, n_groups: int, method: str,
+                      threshold_value: tuple, factor: float):
+        """
+        Same as ``_bounds`` with one row of statistics per group, all computed in one pass.
+        """
+        self._check_method(method, threshold_value)
+        if method == 'z_score':
+            n, center, m2 = group_moments(X, codes, n_groups)
+            # Groups of a single row have no standard deviation (ddof=1), as in pandas.
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scale = np.sqrt(m2 / (n - 1))
+            return center, scale, threshold_value[0], threshold_value[1]
+        Q1, Q3 = group_quantiles(X, codes, n_groups, (25, 75))
+        IQR = Q3 - Q1
+        return 0.0, 1.0, Q1 - factor * IQR, Q3 + factor * IQR
+
+    @instrumented
+    def inlier_mask(self, columns: list, method: str = 'z_score', threshold_value: tuple = (-3, 3),
+                    factor: float = 1.5, block_rows: int = 65536, groupby=None) -> np.ndarray:
+        """
+        Computes, in one vectorized pass, which rows are within bounds in every one of the columns.
+
+        The bounds of all columns come from one call per statistic on a single
+        numeric copy of the columns; the rows are then checked block by block,
+        so no z-score column is ever added to the DataFrame. Rows with a
+        missing value in any of the columns are treated as outliers, as in
+        ``z_score`` and ``IQR``.
+
+        Parameters
+        ----------
+        columns : list
+            The columns to check.
+        method : str, optional
+            'z_score' (bounds from ``threshold_value``) or 'IQR' (bounds Q1 - factor * IQR and Q3 + factor * IQR).
+        threshold_value : tuple, optional
+            Lower and upper z-score thresholds (default is (-3, 3)).
+        factor : float, optional
+            IQR multiplier (default is 1.5).
+        block_rows : int, optional
+            Rows checked at a time, bounding the size of temporaries.
+        groupby : str or list, optional
+            Column(s) defining groups whose rows are checked against the bounds of their own group,
+            as with a groupby-apply but without iterating over the groups. Rows with a missing key
+            form a group of their own.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with one entry per row, True for the rows to keep.
+        """
+        missing = [column for column in columns if column not in self.dataFrame.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+        X = self.dataFrame[columns].to_numpy(dtype='float64')
+        codes = None
+        if groupby is None:
+            center, scale, lower, upper = self._bounds(X, method, threshold_value, factor)
+        else:
+            codes, groups = factorize_groups(self.dataFrame, group_columns(self.dataFrame, groupby))
+            group_stats = self._group_bounds(X, codes, len(groups), method, threshold_value, factor)
+
+        mask = np.empty(len(X), dtype=bool)
+        for start in range(0, len(X), block_rows):
+            block = X[start:start + block_rows]
+            if codes is not None:
+                # Gather the statistics of the group of every row in the block.
+                rows = codes[start:start + block_rows]
+                center, scale, lower, upper = (value[rows] if np.ndim(value) == 2 else value
+                                               for value in group_stats)
+            if method == 'z_score':
+                block = (block - center) / scale
+            mask[start:start + block_rows] = ((block >= lower) & (block <= upper)).all(axis=1)
+        return mask
+
+    @instrumented
+    def remove_outliers(self, columns: list, method: str = 'z_score', threshold_value: tuple = (-3, 3),
+                        factor: float = 1.5, return_index: bool = False, groupby=None):
+        """
+        Removes outliers from many columns at once using the z-score or IQR method.
+
+        Parameters
+        ----------
+        columns : list
+            The columns for which outliers need to be removed.
+        method : str, optional
+            'z_score' or 'IQR' (default is 'z_score').
+        threshold_value : tuple, optional
+            Lower and upper z-score thresholds (default is (-3, 3)).
+        factor : float, optional
+            IQR multiplier (default is 1.5).
+        return_index : bool, optional
+            Return the positions of the rows to keep instead of a filtered copy, so the
+            caller can select them lazily (e.g. ``df.iloc[index]``) (default is False).
+        groupby : str or list, optional
+            Column(s) defining groups with their own bounds (see ``inlier_mask``).
+
+        Returns
+        -------
+        pd.DataFrame or np.ndarray
+            The rows within bounds in every column, or their positions when return_index is True.
+        """
+        mask = self.inlier_mask(columns, method, threshold_value, factor, groupby=groupby)
+        if return_index:
+            return np.flatnonzero(mask)
+        return self.dataFrame[mask]
+
+
+def _sketch_mad(sketch: QuantileSketch, median: float) -> float:
+    """Median absolute deviation around ``median`` of the values summarised by ``sketch``."""
+    items, weights = sketch.weighted_items()
+    if items.size == 0:
+        return np.nan
+    deviations = np.abs(items - median)
+    if sketch.is_exact():
+        return float(np.median(deviations))
+    order = np.argsort(deviations)
+    cumulative = np.cumsum(weights[order])
+    return float(deviations[order][np.searchsorted(cumulative, 0.5 * cumulative[-1])])
+
+
+class OutlierDetector:
+    """
+    A fitted outlier filter whose bounds are learned once (or incrementally)
+    and then applied unchanged to new batches.
+
+    Attributes
+    ----------
+    lower_ : np.ndarray
+        Lower bound of every column.
+    upper_ : np.ndarray
+        Upper bound of every column.
+    rank_error_ : float
+        Rank error bound of the quantile sketches ('IQR' and 'MAD'; 0.0 while they are exact).
+
+    Methods
+    -------
+    fit(X) / partial_fit(X):
+        Learn the bounds from X, or update them with another batch.
+    inlier_mask(X) -> np.ndarray:
+        Boolean mask of the rows of X that are within bounds in every column.
+    transform(X):
+        Filter or clip a batch using the learned bounds, in O(rows).
+    """
+
+    def __init__(self, columns: list = None, method: str = 'z_score', threshold_value: tuple = (-3, 3),
+                 factor: float = 1.5, action: str = 'filter', sketch_k: int = 200, random_state=None):
+        """
+        Parameters
+        ----------
+            columns : list, optional
+                The columns to check (DataFrame labels or array positions). Defaults to every numeric column.
+            method : str, optional
+                'z_score' (running mean and standard deviation), 'IQR' (sketch-based quartiles) or
+                'MAD' (sketch-based median and median absolute deviation).
+            threshold_value : tuple, optional
+                Lower and upper thresholds in standard deviations for 'z_score', and in scaled
+                median absolute deviations (1.4826 * MAD) for 'MAD' (default is (-3, 3)).
+            factor : float, optional
+                IQR multiplier for 'IQR' (default is 1.5).
+            action : str, optional
+                'filter' drops rows outside the bounds, 'clip' clips values to the bounds.
+            sketch_k : int, optional
+                Accuracy parameter of the quantile sketches.
+            random_state : int, optional
+                Seed for the sketch compactions.
+        """
+        if method not in ('z_score', 'IQR', 'MAD'):
+            raise ValueError("method must be 'z_score', 'IQR' or 'MAD'")
+        if action not in ('filter', 'clip'):
+            raise ValueError("action must be 'filter' or 'clip'")
+        if not isinstance(threshold_value, tuple) or len(threshold_value) != 2:
+            raise ValueError("Threshold values should be a tuple containing exactly two values.")
+        self.columns = columns
+        self.method = method
+        self.threshold_value = threshold_value
+        self.factor = factor
+        self.action = action
+        self.sketch_k = sketch_k
+        self.random_state = random_state
+        self._reset()
+
+    def _reset(self):
+        self.columns_ = None
+        self.lower_ = None
+        self.upper_ = None
+        self.rank_error_ = None
+        self._stats = None
+        self._rng = np.random.default_rng(self.random_state)
+
+    def _select(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.columns_ is None:
+                self.columns_ = list(self.columns) if self.columns is not None else \
+                    list(X.select_dtypes(include=[np.number]).columns)
+            missing = [column for column in self.columns_ if column not in X.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+            return X[self.columns_].to_numpy(dtype='float64')
+        X = np.asarray(X, dtype='float64')
+        if X.ndim != 2:
+            raise ValueError("Input array must be 2-dimensional.")
+        if self.columns_ is None:
+            self.columns_ = list(self.columns) if self.columns is not None else list(range(X.shape[1]))
+        return X[:, self.columns_]
+
+    @instrumented
+    def fit(self, X):
+        self._reset()
+        return self.partial_fit(X)
+
+    @instrumented
+    def partial_fit(self, X):
+        values = self._select(X)
+        if len(values) == 0:
+            # Empty micro-batches leave the statistics and bounds unchanged.
+            return self
+        if self.method == 'z_score':
+            stats = _moments(values)
+            self._stats = stats if self._stats is None else _merge_moments(self._stats, stats)
+        else:
+            if self._stats is None:
+                self._stats = [QuantileSketch(self.sketch_k, self._rng) for _ in self.columns_]
+            for sketch, column in zip(self._stats, values.T):
+                sketch.update(column)
+        self._update_bounds()
+        return self
+
+    def _update_bounds(self):
+        lower, upper = self.threshold_value
+        if self.method == 'z_score':
+            n, mean, m2 = self._stats
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(m2 / (n - 1))
+            self.lower_, self.upper_ = mean + lower * std, mean + upper * std
+            self.rank_error_ = 0.0
+            return
+        if self.method == 'IQR':
+            Q1, Q3 = np.array([sketch.quantile([0.25, 0.75]) for sketch in self._stats]).T
+            IQR = Q3 - Q1
+            self.lower_, self.upper_ = Q1 - self.factor * IQR, Q3 + self.factor * IQR
+        else:
+            median = np.array([sketch.quantile(0.5) for sketch in self._stats])
+            mad = np.array([_sketch_mad(sketch, m) for sketch, m in zip(self._stats, median)])
+            self.lower_, self.upper_ = median + lower * MAD_SCALE * mad, median + upper * MAD_SCALE * mad
+        self.rank_error_ = max(sketch.rank_error() for sketch in self._stats)
+
+    @instrumented
+    def inlier_mask(self, X) -> np.ndarray:
+        """
+        Returns a boolean array with one entry per row, True for the rows within bounds in every column.
+        Rows with a missing value in a checked column are outliers.
+        """
+        if self.lower_ is None:
+            raise ValueError("OutlierDetector has not been fitted. Call 'fit' before using 'transform'.")
+        values = self._select(X)
+        return ((values >= self.lower_) & (values <= self.upper_)).all(axis=1)
+
+    @instrumented
+    def transform(self, X):
+        """
+        Filters (action='filter') or clips (action='clip') a batch with the learned bounds.
+
+        Returns
+        -------
+        pd.DataFrame or np.ndarray
+            Same type as X; the input is not modified.
+        """
+        if self.action == 'filter':
+            mask = self.inlier_mask(X)
+            return X[mask] if isinstance(X, pd.DataFrame) else np.asarray(X)[mask]
+        if self.lower_ is None:
+            raise ValueError("OutlierDetector has not been fitted. Call 'fit' before using 'transform'.")
+        clipped = np.clip(self._select(X), self.lower_, self.upper_)
+        # Float columns keep their dtype (a float32 column stays float32);
+        # other columns take the dtype of the clipped values.
+        if isinstance(X, pd.DataFrame):
+            X = X.copy(deep=False)
+            for j, column in enumerate(self.columns_):
+                dtype = X[column].dtype
+                X[column] = clipped[:, j].astype(dtype) if _is_float_dtype(dtype) else clipped[:, j]
+            return X
+        dtype = np.asarray(X).dtype
+        X = np.array(X, dtype=dtype if _is_float_dtype(dtype) else np.result_type(dtype, clipped.dtype))
+        X[:, self.columns_] = clipped
+        return X
+
+    @instrumented
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
@@ -0,0 +1,201 @@
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+import tracemalloc
+
+# Callbacks receiving one record per instrumented operation. While the list
+# is empty every instrumented call goes straight to the wrapped function.
+_hooks = []
+# Nesting level of the running instrumented call and number of hooks asking
+# for memory tracking, per thread (and per asyncio task): operations running
+# concurrently in other threads are neither nested in nor traced by this one.
+_depth = contextvars.ContextVar('preprocessing_tools_depth', default=0)
+_track_memory = contextvars.ContextVar('preprocessing_tools_track_memory', default=0)
+# tracemalloc is process-wide: it runs while any thread traces an operation.
+_tracing_lock = threading.Lock()
+_tracing = 0
+
+# Attributes holding the data of the classes that take it in __init__.
+_DATA_ATTRIBUTES = ('dataframe', 'dataFrame', 'data')
+
+
+def add_hook(callback, track_memory: bool = False):
+    """
+    Register a callback called with a record (dict) after every instrumented operation.
+
+    Each record has the keys:
+        'operation': qualified name, e.g. 'StandardScaler.fit'.
+        'input_shape' / 'output_shape': shapes of the input and of the result (None when they have none).
+        'seconds': wall time of the call.
+        'bytes_allocated': peak memory traced during the call, or None unless track_memory is set
+                           (nested calls are not traced separately).
+        'rows_dropped': input rows minus output rows when both have rows, else None.
+        'depth': nesting level (0 for the outermost call, 1 for the fit called by fit_transform, ...).
+
+    track_memory turns on tracemalloc for the operations run by the calling thread while the hook is
+    registered, which slows every allocation down. Operations traced at the same time in several
+    threads report peaks that include each other's allocations.
+    """
+    _hooks.append(callback)
+    if track_memory:
+        _track_memory.set(_track_memory.get() + 1)
+    return callback
+
+
+def remove_hook(callback, track_memory: bool = False):
+    _hooks.remove(callback)
+    if track_memory:
+        _track_memory.set(_track_memory.get() - 1)
+
+
+class Profiler:
+    """
+    Collects the records of every instrumented operation run inside a
+    ``with profile() as profiler:`` block and summarises them per operation.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record: dict):
+        self.records.append(record)
+
+    def summary(self, top_level_only: bool = True) -> list:
+        """
+        Total time, call count and rows dropped per operation, slowest first.
+        Nested calls (such as the fit inside fit_transform) are left out unless top_level_only is False.
+        """
+        totals = {}
+        for record in self.records:
+            if top_level_only and record['depth']:
+                continue
+            entry = totals.setdefault(record['operation'], dict(operation=record['operation'], calls=0,
+                                                                 seconds=0.0, rows_dropped=0))
+            entry['calls'] += 1
+            entry['seconds'] += record['seconds']
+            entry['rows_dropped'] += record['rows_dropped'] or 0
+        return sorted(totals.values(), key=lambda entry: entry['seconds'], reverse=True)
+
+
+@contextlib.contextmanager
+def profile(track_memory: bool = False, sink=None):
+    """
+    Record every instrumented operation run inside the block.
+
+    Parameters:
+    track_memory (bool): Also record the peak memory allocated by each operation (tracemalloc).
+    sink (callable, optional): Extra callback receiving every record, such as a LoggingSink or a metrics client.
+
+    Yields:
+    Profiler: The collected records.
+    """
+    profiler = Profiler()
+    callbacks = [profiler] if sink is None else [profiler, sink]
+    for callback in callbacks:
+        add_hook(callback, track_memory)
+    try:
+        yield profiler
+    finally:
+        for callback in callbacks:
+            remove_hook(callback, track_memory)
+
+
+class LoggingSink:
+    """
+    Hook that writes every record to a logger, e.g. ``add_hook(LoggingSink())``.
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('preprocessing_tools')
+        self.level = level
+
+    def __call__(self, record: dict):
+        self.logger.log(self.level, "%s input=%s output=%s %.6fs bytes=%s rows_dropped=%s",
+                        record['operation'], record['input_shape'], record['output_shape'], record['seconds'],
+                        record['bytes_allocated'], record['rows_dropped'])
+
+
+def _shape(obj):
+    shape = getattr(obj, 'shape', None)
+    return tuple(shape) if shape is not None else None
+
+
+def _input_of(self, args):
+    if args and _shape(args[0]) is not None:
+        return args[0]
+    for attribute in _DATA_ATTRIBUTES:
+        data = getattr(self, attribute, None)
+        if _shape(data) is not None:
+            return data
+    return None
+
+
+def _start_tracing():
+    # Starts tracemalloc (or resets its peak) for a traced operation and
+    # returns the memory traced at the start. While other threads trace an
+    # operation the peak is left alone, since resetting it would lose theirs.
+    global _tracing
+    with _tracing_lock:
+        if _tracing:
+            _tracing += 1
+        elif not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing = 1
+        else:
+            # Tracing started by the caller is left running.
+            tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracing(start_memory):
+    # Peak memory since start_memory; stops tracemalloc after the last
+    # traced operation when this module started it.
+    global _tracing
+    with _tracing_lock:
+        allocated = tracemalloc.get_traced_memory()[1] - start_memory
+        if _tracing:
+            _tracing -= 1
+            if _tracing == 0:
+                tracemalloc.stop()
+        return allocated
+
+
+def instrumented(method):
+    """
+    Decorator for the public methods of the library: reports the call to the
+    registered hooks, and costs a single list check when there are none.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _hooks:
+            return method(self, *args, **kwargs)
+        input_shape = _shape(_input_of(self, args))
+        depth = _depth.get()
+        # Memory is traced around the outermost operation only, since
+        # resetting the peak inside a nested call would hide the outer one.
+        track_memory = _track_memory.get() and depth == 0
+        if track_memory:
+            start_memory = _start_tracing()
+        token = _depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _depth.reset(token)
+            bytes_allocated = _stop_tracing(start_memory) if track_memory else None
+        output_shape = _shape(result)
+        rows_dropped = None
+        if input_shape and output_shape and len(input_shape) == len(output_shape):
+            rows_dropped = input_shape[0] - output_shape[0]
+        record = dict(operation=f'{type(self).__name__}.{method.__name__}', input_shape=input_shape,
+                      output_shape=output_shape, seconds=seconds, bytes_allocated=bytes_allocated,
+                      rows_dropped=rows_dropped, depth=depth)
+        for hook in list(_hooks):
+            hook(record)
+        return result
+
+    return wrapper
@@ -1,7 +1,17 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from ._utils import BLOCK_ELEMENTS
+from .instrumentation import instrumented
+
+
+def _pairwise_products(X: np.ndarray, out: np.ndarray):
+    """Write the products X[:, i] * X[:, j] (i < j, row-major pair order) into ``out``."""
+    j = 0
+    for i in range(X.shape[1] - 1):
+        width = X.shape[1] - i - 1
+        np.multiply(X[:, i:i + 1], X[:, i + 1:], out=out[:, j:j + width])
+        j += width
+
 
 class InteractionFeaturesGenerator:
     def __init__(self, data: pd.DataFrame):
@@ -13,21 +23,69 @@ class InteractionFeaturesGenerator:
         """
         self.data = data
 
-    def create_interaction_features(self, columns: list) -> pd.DataFrame:
+    @instrumented
+    def interaction_matrix(self, columns: list, dtype=None, chunksize: int = None, out: np.ndarray = None) -> np.ndarray:
+        """
+        Compute every pairwise product of the specified columns into one matrix.
+
+        The products are written into a single preallocated array (or ``out``)
+        in the order ``create_interaction_features`` names them, one
+        broadcast multiply per column and row chunk. The DataFrame is not modified.
+
+        Parameters:
+        columns (list): The columns to generate interaction features for.
+        dtype (optional): Dtype of the result, e.g. 'float32'. Defaults to the common dtype of the columns.
+        chunksize (int, optional): Rows processed at a time; chosen from the number of columns when omitted.
+        out (np.ndarray, optional): Preallocated array of shape (rows, n_pairs) to write into.
+
+        Returns:
+        np.ndarray: Array of shape (rows, len(columns) * (len(columns) - 1) / 2).
+        """
+        arrays = [self.data[column].to_numpy() for column in columns]
+        if dtype is None:
+            dtype = np.result_type(*arrays) if arrays else np.float64
+        n_rows, n_pairs = len(self.data), len(columns) * (len(columns) - 1) // 2
+        if out is None:
+            out = np.empty((n_rows, n_pairs), dtype=dtype)
+        elif out.shape != (n_rows, n_pairs):
+            raise ValueError(f"out must have shape {(n_rows, n_pairs)}, got {out.shape}")
+        if chunksize is None:
+            chunksize = max(1, BLOCK_ELEMENTS // max(1, len(columns)))
+        for start in range(0, n_rows, chunksize):
+            stop = min(start + chunksize, n_rows)
+            X = np.empty((stop - start, len(columns)), dtype=out.dtype)
+            for i, array in enumerate(arrays):
+                X[:, i] = array[start:stop]
+            _pairwise_products(X, out[start:stop])
+        return out
+
+    @instrumented
+    def create_interaction_features(self, columns: list, dtype=None, chunksize: int = None,
+                                    return_array: bool = False) -> pd.DataFrame:
         """
         Create interaction features for specified columns in the DataFrame.
 
+        All products are computed in one pass into a single block (see
+        ``interaction_matrix``) that is attached to the DataFrame with one concat.
+
         Parameters:
         columns (list): The columns to generate interaction features for.
+        dtype (optional): Dtype of the new columns, e.g. 'float32'. Defaults to the common dtype of the columns.
+        chunksize (int, optional): Rows processed at a time.
+        return_array (bool, optional): Return the products as a numpy array instead of adding them to the DataFrame.
 
         Returns:
-        pd.DataFrame: DataFrame with additional columns for the interaction features.
+        pd.DataFrame: DataFrame with additional columns for the interaction features
+        (np.ndarray of the products when return_array is True).
         """
         try:
-            for i in range(len(columns)):
-                for j in range(i + 1, len(columns)):
-                    col1, col2 = columns[i], columns[j]
-                    self.data[f'{col1}_x_{col2}'] = self.data[col1] * self.data[col2]
+            block = self.interaction_matrix(columns, dtype=dtype, chunksize=chunksize)
+            if return_array:
+                return block
+            names = [f'{columns[i]}_x_{columns[j]}' for i in range(len(columns)) for j in range(i + 1, len(columns))]
+            features = pd.DataFrame(block, index=self.data.index, columns=names, copy=False)
+            existing = [name for name in names if name in self.data.columns]
+            self.data = pd.concat([self.data.drop(columns=existing), features], axis=1)
             return self.data
 
         except KeyError as e:
@@ -40,6 +98,7 @@ class InteractionFeaturesGenerator:
             print(f"An unexpected error occurred while creating interaction features: {e}")
             return self.data
 
+    @instrumented
     def apply_interaction_features(self, columns: list) -> pd.DataFrame:
         """
         Apply interaction feature generation to specified columns.
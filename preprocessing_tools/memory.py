@@ -0,0 +1,116 @@
+"""
+Memory footprint of DataFrames and safe dtype downcasting.
+
+``optimize_dtypes`` stores every column in the narrowest dtype that holds its
+values, and ``memory_report`` lists the bytes of each column before and after.
+The other modules keep these compact dtypes: the scalers transform float32
+input in float32, and the encoders, binners and imputers do not widen the
+columns they return.
+"""
+import numpy as np
+import pandas as pd
+from .dataEncoding import _smallest_int_dtype
+
+FLOAT_PRECISIONS = ('lossless', 'float32', None)
+
+
+def _smallest_uint_dtype(high: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if high <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def _downcast(series: pd.Series, float_precision, max_category_ratio):
+    # The narrowest dtype holding every value of the column, or None to keep it.
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        if series.empty:
+            return None
+        high = int(series.max())
+        target = _smallest_uint_dtype(high) if dtype.kind == 'u' else _smallest_int_dtype(int(series.min()), high)
+        return target if target.itemsize < dtype.itemsize else None
+    if isinstance(dtype, np.dtype) and dtype == np.float64 and float_precision is not None:
+        values = series.to_numpy()
+        down = values.astype(np.float32)
+        if float_precision == 'lossless':
+            return down.dtype if np.array_equal(down, values, equal_nan=True) else None
+        # Values beyond the float32 range would become infinite.
+        finite = np.isfinite(values)
+        if finite.any() and np.abs(values[finite]).max() > np.finfo(np.float32).max:
+            return None
+        return down.dtype
+    if (max_category_ratio is not None and len(series)
+            and (dtype == object or isinstance(dtype, pd.StringDtype))
+            and series.nunique() <= max_category_ratio * len(series)):
+        return 'category'
+    return None
+
+
+def optimize_dtypes(data: pd.DataFrame, float_precision='lossless', max_category_ratio: float = 0.5,
+                    columns: list = None) -> pd.DataFrame:
+    """
+    Downcast the columns of a DataFrame to the narrowest dtypes that hold their values.
+
+    * Integer columns go to the smallest integer width (int8 ... int64, and
+      uint8 ... uint64 for unsigned columns) that holds their minimum and maximum.
+    * float64 columns go to float32 when every value survives the round trip
+      ('lossless', the default), always when float_precision is 'float32'
+      (unless a value is beyond the float32 range), or never when it is None.
+    * Object and string columns with at most max_category_ratio distinct
+      values per row become categoricals.
+
+    Parameters:
+    data (pd.DataFrame): The DataFrame to optimize; it is not modified.
+    float_precision (str or None): 'lossless', 'float32' or None.
+    max_category_ratio (float or None): Highest ratio of distinct values to rows for a string column
+                                        to become a categorical; None keeps string columns.
+    columns (list, optional): The columns to consider; all columns when omitted.
+
+    Returns:
+    pd.DataFrame: A new DataFrame sharing the columns that were not converted.
+
+    Raises:
+    ValueError: If data is not a DataFrame, a column does not exist or float_precision is invalid.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError("Input data must be a pandas DataFrame.")
+    if float_precision not in FLOAT_PRECISIONS:
+        raise ValueError("float_precision must be 'lossless', 'float32' or None")
+    columns = list(data.columns) if columns is None else list(columns)
+    missing = [column for column in columns if column not in data.columns]
+    if missing:
+        raise ValueError(f"Columns {missing} do not exist in the DataFrame.")
+
+    optimized = data.copy(deep=False)
+    for column in columns:
+        target = _downcast(data[column], float_precision, max_category_ratio)
+        if target is not None:
+            optimized[column] = data[column].astype(target)
+    return optimized
+
+
+def memory_report(data: pd.DataFrame, optimized: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Bytes used by each column, including the contents of strings and other objects.
+
+    Parameters:
+    data (pd.DataFrame): The DataFrame to profile.
+    optimized (pd.DataFrame, optional): The same data after optimize_dtypes, to compare with.
+
+    Returns:
+    pd.DataFrame: One row per column with its 'dtype' and 'bytes', plus 'optimized_dtype',
+                  'optimized_bytes' and 'saved_bytes' when optimized is given.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError("Input data must be a pandas DataFrame.")
+    report = pd.DataFrame({'dtype': data.dtypes.astype(str).to_numpy(),
+                           'bytes': data.memory_usage(index=False, deep=True).to_numpy()},
+                          index=data.columns)
+    if optimized is not None:
+        if not optimized.columns.equals(data.columns):
+            raise ValueError("optimized must have the same columns as data.")
+        report['optimized_dtype'] = optimized.dtypes.astype(str).to_numpy()
+        report['optimized_bytes'] = optimized.memory_usage(index=False, deep=True).to_numpy()
+        report['saved_bytes'] = report['bytes'] - report['optimized_bytes']
+    return report
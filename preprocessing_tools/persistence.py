@@ -0,0 +1,225 @@
+"""
+Compact, versioned storage for fitted objects.
+
+File layout::
+
+    magic (8 bytes) | format version (uint32) | header length (uint32)
+    | JSON header | padding | raw arrays, each starting on a 64-byte boundary
+
+The JSON header holds the class name and the attributes of the object.
+Every numeric array is written once as raw bytes and referenced from the
+header by dtype, shape and offset, so ``load`` can map the file and hand out
+read-only ``np.frombuffer`` views of it without copying or parsing. Unlike
+pickle, loading never imports or runs arbitrary code: only classes defined in
+this package can be rebuilt.
+"""
+import json
+import mmap as _mmap
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'PPTSTATE'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct('<8sII')
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _classes() -> dict:
+    from . import _sketch, binning, data_cleaner, dataEncoding, handling_outliers, pipeline, scaler, transform
+
+    modules = (_sketch, binning, data_cleaner, dataEncoding, handling_outliers, pipeline, scaler, transform)
+    return {value.__name__: value for module in modules for value in vars(module).values()
+            if isinstance(value, type) and value.__module__ == module.__name__}
+
+
+class _Encoder:
+    def __init__(self, classes: dict):
+        self.classes = classes
+        self.arrays = []
+        # Random generators are often shared (a scaler and its sketches), so
+        # each is stored once and referenced, to keep sharing after load.
+        self.generators = {}
+
+    def array(self, values: np.ndarray) -> int:
+        if values.dtype.hasobject:
+            if not all(isinstance(value, str) for value in values.ravel()):
+                raise TypeError("Only numeric, boolean and string arrays can be saved.")
+            values = values.astype(str)
+        self.arrays.append(np.ascontiguousarray(values))
+        return len(self.arrays) - 1
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return {'__array__': self.array(value)}
+        if isinstance(value, pd.MultiIndex):
+            return {'__multiindex__': [self.encode(level) for level in value.levels],
+                    'codes': [self.array(codes) for codes in value.codes], 'names': self.encode(list(value.names))}
+        if isinstance(value, pd.Index):
+            if isinstance(value.dtype, pd.StringDtype) and value.dtype.storage == 'pyarrow':
+                return self.arrow_strings(value)
+            return {'__index__': self.array(value.to_numpy()), 'name': self.encode(value.name)}
+        if isinstance(value, np.dtype):
+            return {'__dtype__': value.str}
+        if isinstance(value, np.random.Generator):
+            position = self.generators.setdefault(id(value), len(self.generators))
+            return {'__generator__': position, 'state': value.bit_generator.state}
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {'__tuple__': [self.encode(item) for item in value]}
+        if isinstance(value, dict):
+            return {'__dict__': [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+        if self.classes.get(type(value).__name__) is type(value):
+            return {'__object__': type(value).__name__, 'state': self.encode(vars(value))}
+        raise TypeError(f"Objects of type {type(value).__name__} cannot be saved.")
+
+    def arrow_strings(self, index: pd.Index):
+        # Arrow-backed string vocabularies are stored as their offsets and
+        # UTF-8 data buffers, which load back without decoding any string.
+        import pyarrow as pa
+
+        values = pa.array(index.array)
+        if isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        if values.null_count:
+            return {'__index__': self.array(index.to_numpy()), 'name': self.encode(index.name)}
+        values = values.cast(pa.large_string())
+        _, offsets, data = values.buffers()
+        offsets = np.frombuffer(offsets, dtype=np.int64)[values.offset:values.offset + len(values) + 1]
+        data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.empty(0, dtype=np.uint8)
+        return {'__strings__': [self.array(offsets - offsets[0]), self.array(data[offsets[0]:offsets[-1]])],
+                'na_value_is_nan': index.dtype.na_value is not pd.NA, 'name': self.encode(index.name)}
+
+
+class _Decoder:
+    def __init__(self, classes: dict, arrays: list):
+        self.classes = classes
+        self.arrays = arrays
+        self.generators = {}
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if '__array__' in value:
+            return self.arrays[value['__array__']]
+        if '__index__' in value:
+            return pd.Index(self.arrays[value['__index__']], name=self.decode(value['name']))
+        if '__multiindex__' in value:
+            return pd.MultiIndex(levels=[self.decode(level) for level in value['__multiindex__']],
+                                 codes=[self.arrays[position] for position in value['codes']],
+                                 names=self.decode(value['names']), verify_integrity=False)
+        if '__dtype__' in value:
+            return np.dtype(value['__dtype__'])
+        if '__strings__' in value:
+            import pyarrow as pa
+
+            offsets, data = (self.arrays[position] for position in value['__strings__'])
+            strings = pa.LargeStringArray.from_buffers(len(offsets) - 1, pa.py_buffer(offsets), pa.py_buffer(data))
+            dtype = pd.StringDtype('pyarrow', na_value=np.nan if value['na_value_is_nan'] else pd.NA)
+            return pd.Index(pd.arrays.ArrowStringArray(strings), name=self.decode(value['name'])).astype(dtype)
+        if '__generator__' in value:
+            if value['__generator__'] not in self.generators:
+                generator = np.random.default_rng()
+                generator.bit_generator.state = value['state']
+                self.generators[value['__generator__']] = generator
+            return self.generators[value['__generator__']]
+        if '__tuple__' in value:
+            return tuple(self.decode(item) for item in value['__tuple__'])
+        if '__dict__' in value:
+            return {_hashable(self.decode(key)): self.decode(item) for key, item in value['__dict__']}
+        if '__object__' in value:
+            cls = self.classes.get(value['__object__'])
+            if cls is None:
+                raise ValueError(f"Unknown class '{value['__object__']}' in the saved file.")
+            obj = cls.__new__(cls)
+            obj.__dict__.update(self.decode(value['state']))
+            return obj
+        raise ValueError("Malformed header in the saved file.")
+
+
+def _hashable(key):
+    return tuple(_hashable(item) for item in key) if isinstance(key, list) else key
+
+
+def save(obj, path):
+    """
+    Save a fitted object (scaler, encoder, binner, imputer, outlier detector or pipeline) to ``path``.
+
+    Numeric arrays are stored as raw aligned bytes; everything else goes to a
+    small JSON header. Raises TypeError for attributes that cannot be stored.
+    """
+    encoder = _Encoder(_classes())
+    state = encoder.encode(obj)
+    if not isinstance(state, dict) or '__object__' not in state:
+        raise TypeError(f"Objects of type {type(obj).__name__} cannot be saved.")
+
+    offsets, offset = [], 0
+    for values in encoder.arrays:
+        offsets.append(offset)
+        offset = _aligned(offset + values.nbytes)
+    header = json.dumps({
+        'state': state,
+        'arrays': [{'dtype': values.dtype.str, 'shape': list(values.shape), 'offset': position}
+                   for values, position in zip(encoder.arrays, offsets)],
+    }).encode('utf-8')
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for values, position in zip(encoder.arrays, offsets):
+            f.seek(data_start + position)
+            f.write(values.tobytes())
+        f.truncate(data_start + offset)
+
+
+def load(path, mmap: bool = True):
+    """
+    Load an object written by ``save``.
+
+    With ``mmap=True`` (the default) the file is memory-mapped and the fitted
+    arrays are read-only views of the mapping, so loading costs the JSON
+    header only and pages are read on first use. With ``mmap=False`` the file
+    is read into memory once.
+    """
+    try:
+        with open(path, 'rb') as f:
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) if mmap else f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file at {path} was not found.")
+    except ValueError:
+        raise ValueError("The file is empty.")
+    if len(buffer) < _PREFIX.size:
+        raise ValueError(f"{path} is not a saved preprocessing_tools object.")
+    magic, version, header_length = _PREFIX.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a saved preprocessing_tools object.")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path} was written by a newer version (format {version}); "
+                         f"this version reads format {FORMAT_VERSION} and older.")
+    header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + header_length]).decode('utf-8'))
+    data_start = _aligned(_PREFIX.size + header_length)
+
+    arrays = []
+    for spec in header['arrays']:
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(spec['shape'])
+        count = int(np.prod(shape))
+        if count == 0:
+            arrays.append(np.empty(shape, dtype=dtype))
+            continue
+        values = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + spec['offset'])
+        arrays.append(values.reshape(shape))
+    return _Decoder(_classes(), arrays).decode(header['state'])
@@ -0,0 +1,358 @@
+import numpy as np
+import pandas as pd
+
+from ._utils import BLOCK_BYTES, MIN_BLOCK_ROWS, ScalerMixin
+from .interaction_features import _pairwise_products
+from .instrumentation import instrumented
+
+
+class ImputeStep:
+    """
+    Pipeline step filling missing values with a per-column statistic.
+
+    Parameters:
+    strategy (str): 'mean' (as DataCleaner.fill_with_mean) or 'zero' (as DataCleaner.fill_with_zeros).
+    """
+
+    def __init__(self, strategy: str = 'mean'):
+        if strategy not in ('mean', 'zero'):
+            raise ValueError("strategy must be 'mean' or 'zero'")
+        self.strategy = strategy
+        self._reset()
+
+    def _reset(self):
+        self.statistics_ = None
+        self._count = None
+        self._total = None
+
+    def partial_fit(self, X: np.ndarray):
+        mask = ~np.isnan(X)
+        count = mask.sum(axis=0)
+        total = np.where(mask, X, 0).sum(axis=0, dtype='float64')
+        if self._count is None:
+            self._count, self._total = count, total
+        else:
+            self._count = self._count + count
+            self._total = self._total + total
+        if self.strategy == 'zero':
+            self.statistics_ = np.zeros(len(count))
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.statistics_ = self._total / self._count
+        return self
+
+    def fit(self, X: np.ndarray):
+        self._reset()
+        return self.partial_fit(X)
+
+    def _transform_block(self, block: np.ndarray):
+        np.copyto(block, self.statistics_.astype(block.dtype, copy=False), where=np.isnan(block))
+
+
+class EncodeStep:
+    """
+    Pipeline step encoding categorical columns of the input DataFrame.
+
+    Categories are learned once at fit time, so codes are stable between
+    fit and transform; values not seen during fit are encoded as -1
+    ('label') or as an all-zero row ('onehot').
+
+    Parameters:
+    columns (list): The columns to encode.
+    method (str): 'label' (as DataEncoding.label_encode) or 'onehot' (as DataEncoding.one_hot_encode).
+    """
+
+    def __init__(self, columns: list, method: str = 'label'):
+        if method not in ('label', 'onehot'):
+            raise ValueError("method must be 'label' or 'onehot'")
+        self.columns = list(columns)
+        self.method = method
+        self.categories_ = None
+
+    def fit(self, data: pd.DataFrame):
+        for column in self.columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' is not in the DataFrame.")
+        self.categories_ = {column: data[column].astype('category').cat.categories for column in self.columns}
+        return self
+
+    def _codes(self, data: pd.DataFrame) -> dict:
+        return {
+            column: pd.Categorical(data[column], categories=self.categories_[column]).codes
+            for column in self.columns
+        }
+
+
+class PolynomialStep:
+    """
+    Pipeline step appending the powers 2..degree of the given columns (named
+    like PolynomialFeaturesGenerator, e.g. 'x^2'). Every power is computed
+    from the previous one with a single multiply.
+
+    Parameters:
+    columns (list): The columns to generate polynomial features for.
+    degree (int): The degree of the polynomial features.
+    """
+
+    def __init__(self, columns: list, degree: int):
+        self.columns = list(columns)
+        self.degree = degree
+
+    def _get_feature_names_out(self, names: list) -> list:
+        self._sources = [_index_of(names, column) for column in self.columns]
+        self._offset = len(names)
+        return names + [f'{column}^{d}' for column in self.columns for d in range(2, self.degree + 1)]
+
+    def _transform_block(self, block: np.ndarray):
+        j = self._offset
+        for i in self._sources:
+            previous = i
+            for _ in range(2, self.degree + 1):
+                np.multiply(block[:, previous], block[:, i], out=block[:, j])
+                previous = j
+                j += 1
+
+
+class InteractionStep:
+    """
+    Pipeline step appending the pairwise products of the given columns (named
+    like InteractionFeaturesGenerator, e.g. 'a_x_b').
+
+    Parameters:
+    columns (list): The columns to generate interaction features for.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = list(columns)
+
+    def _get_feature_names_out(self, names: list) -> list:
+        self._sources = [_index_of(names, column) for column in self.columns]
+        self._offset = len(names)
+        return names + [
+            f'{self.columns[i]}_x_{self.columns[j]}'
+            for i in range(len(self.columns)) for j in range(i + 1, len(self.columns))
+        ]
+
+    def _transform_block(self, block: np.ndarray):
+        _pairwise_products(block[:, self._sources], block[:, self._offset:])
+
+
+def _index_of(names, column):
+    try:
+        return names.index(column)
+    except ValueError:
+        raise ValueError(f"Column '{column}' is not available at this step of the pipeline.")
+
+
+class Pipeline:
+    """
+    A chain of preprocessing steps that is planned once and run block by block.
+
+    The steps run in order. ``EncodeStep`` steps come first and act on the
+    categorical columns of the input DataFrame; every other step is numeric:
+    ``ImputeStep``, any of the scalers (``MinMaxScaler``, ``StandardScaler``,
+    ``MaxAbsScaler``, ``RobustScaler``), ``PolynomialStep`` and
+    ``InteractionStep``.
+
+    ``transform`` allocates the output matrix once, then for each block of
+    rows (sized so the block stays in cache) it copies and encodes the input
+    columns into the block and runs every numeric step over it in place,
+    with feature generators writing their new columns next to their inputs.
+    No intermediate DataFrame is built and the input is never modified.
+
+    ``fit`` fits the steps in order with one streaming pass per stateful step
+    over the same blocks (``partial_fit``), so peak memory stays at one
+    block per step; a ``RobustScaler`` with ``method='exact'`` is fitted on
+    its materialised input instead.
+
+    Parameters:
+    steps (list): (name, step) pairs.
+    dtype (str or np.dtype): Floating point dtype of the output matrix.
+    block_rows (int, optional): Rows per block; chosen from the output width when omitted.
+    """
+
+    def __init__(self, steps: list, dtype='float64', block_rows: int = None):
+        if not steps:
+            raise ValueError("A Pipeline needs at least one step.")
+        self.steps = list(steps)
+        self.dtype = ScalerMixin._check_dtype(dtype)
+        self.block_rows = block_rows
+        seen_numeric = False
+        for name, step in self.steps:
+            if isinstance(step, EncodeStep):
+                if seen_numeric:
+                    raise ValueError(f"EncodeStep '{name}' must come before every numeric step.")
+            elif isinstance(step, (ImputeStep, PolynomialStep, InteractionStep, ScalerMixin)):
+                seen_numeric = True
+            else:
+                raise TypeError(f"Step '{name}' is not a supported pipeline step.")
+        self.feature_names_out_ = None
+
+    @property
+    def named_steps(self) -> dict:
+        return dict(self.steps)
+
+    def _encoders(self):
+        return [step for _, step in self.steps if isinstance(step, EncodeStep)]
+
+    def _numeric_steps(self):
+        return [step for _, step in self.steps if not isinstance(step, EncodeStep)]
+
+    def _plan_input(self, data):
+        """Decide which source column fills each input column of the numeric steps."""
+        if isinstance(data, np.ndarray):
+            if self._encoders():
+                raise ValueError("EncodeStep requires a pandas DataFrame input.")
+            if data.ndim != 2:
+                raise ValueError("Input array must be 2-dimensional.")
+            return [('array', data.shape[1])], list(range(data.shape[1]))
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame or a numpy array.")
+
+        encoded = {}
+        for encoder in self._encoders():
+            for column in encoder.columns:
+                encoded[column] = encoder
+        plan, names, dummies, skipped = [], [], [], False
+        for column in data.columns:
+            encoder = encoded.get(column)
+            if encoder is not None and encoder.method == 'label':
+                plan.append(('label', column))
+                names.append(column)
+            elif encoder is not None:
+                dummies.append(column)
+            elif pd.api.types.is_numeric_dtype(data[column]):
+                plan.append(('column', column))
+                names.append(column)
+            else:
+                skipped = True
+        if skipped:
+            print("WARNING! Not all columns in the DataFrame are numeric. Non-numeric columns will be skipped.")
+        for column in dummies:
+            categories = encoded[column].categories_[column]
+            plan.append(('onehot', column, len(categories)))
+            names.extend(f'{column}_{category}' for category in categories)
+        if not names:
+            raise ValueError("No numeric or encoded columns found in the DataFrame")
+        return plan, names
+
+    def _sources(self, data):
+        # Column arrays (views where pandas allows) and category codes, taken once per call.
+        if isinstance(data, np.ndarray):
+            return {'array': data}
+        sources = {}
+        for kind, column, *_ in self._plan:
+            if kind == 'column':
+                sources[column] = data[column].to_numpy()
+        for encoder in self._encoders():
+            sources.update(encoder._codes(data))
+        return sources
+
+    def _fill_input(self, sources, start, stop, block):
+        j = 0
+        for entry in self._plan:
+            kind = entry[0]
+            if kind == 'array':
+                block[:, j:j + entry[1]] = sources['array'][start:stop]
+                j += entry[1]
+            elif kind in ('column', 'label'):
+                block[:, j] = sources[entry[1]][start:stop]
+                j += 1
+            else:
+                width = entry[2]
+                codes = sources[entry[1]][start:stop]
+                target = block[:, j:j + width]
+                target[...] = 0
+                rows = np.flatnonzero(codes >= 0)
+                target[rows, codes[rows]] = 1
+                j += width
+
+    def _run_block(self, sources, start, stop, block, n_steps):
+        self._fill_input(sources, start, stop, block[:, :self._widths[0]])
+        for step, width in zip(self._numeric_steps()[:n_steps], self._widths[1:]):
+            view = block[:, :width]
+            if isinstance(step, ScalerMixin):
+                step._transform_inplace(view)
+            else:
+                step._transform_block(view)
+
+    def _row_bounds(self, n_rows, width):
+        block_rows = self.block_rows
+        if block_rows is None:
+            block_rows = max(MIN_BLOCK_ROWS, BLOCK_BYTES // max(1, width * self.dtype.itemsize))
+        return range(0, n_rows, block_rows), block_rows
+
+    @instrumented
+    def fit(self, data):
+        for encoder in self._encoders():
+            encoder.fit(data)
+        self._plan, names = self._plan_input(data)
+        self._widths = [len(names)]
+        sources = self._sources(data)
+        n_rows = len(data)
+
+        for k, step in enumerate(self._numeric_steps()):
+            width = self._widths[-1]
+            if isinstance(step, (PolynomialStep, InteractionStep)):
+                names = step._get_feature_names_out(names)
+                self._widths.append(len(names))
+                continue
+            starts, block_rows = self._row_bounds(n_rows, width)
+            if isinstance(step, ScalerMixin) and not step._supports_partial_fit():
+                # Exact quantiles need every row at once.
+                full = np.empty((n_rows, width), dtype=self.dtype)
+                for start in starts:
+                    stop = min(start + block_rows, n_rows)
+                    self._run_block(sources, start, stop, full[start:stop], k)
+                step.fit(full)
+                del full
+            else:
+                step._reset()
+                scratch = np.empty((block_rows, width), dtype=self.dtype)
+                for start in starts:
+                    stop = min(start + block_rows, n_rows)
+                    block = scratch[:stop - start]
+                    self._run_block(sources, start, stop, block, k)
+                    step.partial_fit(block)
+                if isinstance(step, ScalerMixin):
+                    step._check_scale()
+            self._widths.append(width)
+
+        self.feature_names_out_ = names
+        return self
+
+    @instrumented
+    def transform(self, data, as_frame: bool = False):
+        """
+        Transform ``data`` into one preallocated matrix.
+
+        Parameters:
+        data (pd.DataFrame or np.ndarray): The input data.
+        as_frame (bool, optional): Wrap the result in a DataFrame with the output column names and the input index.
+
+        Returns:
+        np.ndarray or pd.DataFrame: The transformed data.
+        """
+        if self.feature_names_out_ is None:
+            raise ValueError("Pipeline has not been fitted. Call 'fit' before using 'transform'.")
+        plan, names = self._plan_input(data)
+        if plan != self._plan:
+            raise ValueError("The input columns do not match the columns the pipeline was fitted with.")
+        sources = self._sources(data)
+        n_rows = len(data)
+        width = self._widths[-1]
+        out = np.empty((n_rows, width), dtype=self.dtype)
+        starts, block_rows = self._row_bounds(n_rows, width)
+        n_steps = len(self._numeric_steps())
+        for start in starts:
+            stop = min(start + block_rows, n_rows)
+            self._run_block(sources, start, stop, out[start:stop], n_steps)
+        if as_frame:
+            index = data.index if isinstance(data, pd.DataFrame) else None
+            return pd.DataFrame(out, index=index, columns=self.feature_names_out_, copy=False)
+        return out
+
+    @instrumented
+    def fit_transform(self, data, as_frame: bool = False):
+        return self.fit(data).transform(data, as_frame=as_frame)
+
@@ -1,7 +1,20 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from itertools import combinations, combinations_with_replacement
+from math import comb
+from ._utils import BLOCK_ELEMENTS
+from .instrumentation import instrumented
+
+
+def _monomial_name(names: tuple) -> str:
+    if not names:
+        return '1'
+    parts = []
+    for name in dict.fromkeys(names):
+        power = names.count(name)
+        parts.append(f'{name}^{power}' if power > 1 else f'{name}')
+    return '_x_'.join(parts)
+
 
 class PolynomialFeaturesGenerator:
     def __init__(self, data: pd.DataFrame):
@@ -13,6 +26,7 @@ class PolynomialFeaturesGenerator:
         """
         self.data = data
 
+    @instrumented
     def create_polynomial_features(self, columns: list, degree: int) -> pd.DataFrame:
         """
         Create polynomial features for specified columns in the DataFrame.
@@ -40,6 +54,151 @@ class PolynomialFeaturesGenerator:
             print(f"An unexpected error occurred while creating polynomial features: {e}")
             return self.data
 
+    @staticmethod
+    def n_output_features(n_columns: int, degree: int, include_bias: bool = False,
+                          interaction_only: bool = False) -> int:
+        """
+        Number of columns of the full polynomial expansion, known before anything is allocated.
+
+        Parameters:
+        n_columns (int): The number of input columns.
+        degree (int): The maximum degree of the monomials.
+        include_bias (bool, optional): Whether the constant term is counted.
+        interaction_only (bool, optional): Whether only products of distinct columns are counted.
+
+        Returns:
+        int: The width of the expansion.
+        """
+        start = 0 if include_bias else 1
+        if interaction_only:
+            return sum(comb(n_columns, d) for d in range(start, degree + 1))
+        return sum(comb(n_columns + d - 1, d) for d in range(start, degree + 1))
+
+    @staticmethod
+    def polynomial_feature_names(columns: list, degree: int, include_bias: bool = False,
+                                 interaction_only: bool = False) -> list:
+        """
+        Names of the columns of the full polynomial expansion, e.g. ['x1', 'x2', 'x1^2', 'x1_x_x2', 'x2^2'].
+        """
+        combine = combinations if interaction_only else combinations_with_replacement
+        start = 0 if include_bias else 1
+        return [_monomial_name(terms) for d in range(start, degree + 1) for terms in combine(columns, d)]
+
+    @instrumented
+    def polynomial_matrix(self, columns: list, degree: int, include_bias: bool = False,
+                          interaction_only: bool = False, dtype=None, chunksize: int = None,
+                          out: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the full degree-``degree`` polynomial expansion (with cross terms) of the specified columns.
+
+        Columns follow ``polynomial_feature_names``: the bias, the columns
+        themselves, then the monomials of each higher degree. Every monomial
+        of degree d is the product of an already computed monomial of degree
+        d - 1 and one input column, so each new feature costs one multiply.
+        The result is written into one preallocated array (or ``out``), one
+        row chunk at a time. The DataFrame is not modified.
+
+        Parameters:
+        columns (list): The columns to expand.
+        degree (int): The maximum degree of the monomials.
+        include_bias (bool, optional): Whether to include the constant column.
+        interaction_only (bool, optional): Whether to keep only products of distinct columns.
+        dtype (optional): Dtype of the result, e.g. 'float32'. Defaults to the common dtype of the columns.
+        chunksize (int, optional): Rows processed at a time; chosen from the output width when omitted.
+        out (np.ndarray, optional): Preallocated array of shape (rows, n_output_features) to write into.
+
+        Returns:
+        np.ndarray: The expansion, of shape (rows, n_output_features).
+        """
+        if degree < 1:
+            raise ValueError("degree must be at least 1")
+        arrays = [self.data[column].to_numpy() for column in columns]
+        if dtype is None:
+            dtype = np.result_type(*arrays) if arrays else np.float64
+        n_rows = len(self.data)
+        width = self.n_output_features(len(columns), degree, include_bias, interaction_only)
+        if out is None:
+            out = np.empty((n_rows, width), dtype=dtype)
+        elif out.shape != (n_rows, width):
+            raise ValueError(f"out must have shape {(n_rows, width)}, got {out.shape}")
+        if chunksize is None:
+            chunksize = max(1, BLOCK_ELEMENTS // max(1, width))
+
+        n = len(columns)
+        for start in range(0, n_rows, chunksize):
+            stop = min(start + chunksize, n_rows)
+            XP = out[start:stop]
+            current = 0
+            if include_bias:
+                XP[:, 0] = 1
+                current = 1
+            for i, array in enumerate(arrays):
+                XP[:, current + i] = array[start:stop]
+            X = XP[:, current:current + n]
+            # index[f] is the first column of the previous degree whose monomial
+            # starts with input column f; index[n] is the end of that degree.
+            index = list(range(current, current + n + 1))
+            current += n
+            for _ in range(2, degree + 1):
+                new_index = []
+                end = index[-1]
+                for f in range(n):
+                    first = index[f]
+                    new_index.append(current)
+                    if interaction_only:
+                        first += index[f + 1] - index[f]
+                    next_current = current + end - first
+                    if next_current <= current:
+                        break
+                    np.multiply(XP[:, first:end], X[:, f:f + 1], out=XP[:, current:next_current])
+                    current = next_current
+                new_index.extend([current] * (n + 1 - len(new_index)))
+                index = new_index
+        return out
+
+    @instrumented
+    def create_polynomial_expansion(self, columns: list, degree: int, include_bias: bool = False,
+                                    interaction_only: bool = False, dtype=None, chunksize: int = None,
+                                    return_array: bool = False) -> pd.DataFrame:
+        """
+        Create the full polynomial expansion (including cross terms) of the specified columns.
+
+        Parameters:
+        columns (list): The columns to expand.
+        degree (int): The maximum degree of the monomials.
+        include_bias (bool, optional): Whether to include the constant column.
+        interaction_only (bool, optional): Whether to keep only products of distinct columns.
+        dtype (optional): Dtype of the new columns, e.g. 'float32'.
+        chunksize (int, optional): Rows processed at a time.
+        return_array (bool, optional): Return the whole expansion as a numpy array (a drop-in for
+            sklearn's PolynomialFeatures) instead of adding the terms of degree 2 and above to the DataFrame.
+
+        Returns:
+        pd.DataFrame: DataFrame with additional columns for the monomials of degree 2 and above
+        (np.ndarray of the whole expansion when return_array is True).
+        """
+        try:
+            block = self.polynomial_matrix(columns, degree, include_bias, interaction_only, dtype, chunksize)
+            if return_array:
+                return block
+            names = self.polynomial_feature_names(columns, degree, include_bias, interaction_only)
+            first = int(include_bias) + len(columns)
+            features = pd.DataFrame(block[:, first:], index=self.data.index, columns=names[first:], copy=False)
+            existing = [name for name in features.columns if name in self.data.columns]
+            self.data = pd.concat([self.data.drop(columns=existing), features], axis=1)
+            return self.data
+
+        except KeyError as e:
+            print(f"Key error occurred: {e}")
+            return self.data
+        except ValueError as e:
+            print(f"Value error occurred: {e}")
+            return self.data
+        except Exception as e:
+            print(f"An unexpected error occurred while creating polynomial features: {e}")
+            return self.data
+
+    @instrumented
     def apply_polynomial_features(self, columns: list, degree: int) -> pd.DataFrame:
         """
         Apply polynomial feature generation to specified columns.
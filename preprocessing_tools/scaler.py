@@ -1,125 +1,406 @@
+import functools
+import warnings
 import numpy as np
-import pandas as pd
 from ._utils import *
+from ._utils import _moments, _merge_moments, _effective_n_jobs, _row_blocks
+from ._sketch import QuantileSketch
+from ._groups import group_moments, group_quantiles
+from .instrumentation import instrumented
 
 
 class MinMaxScaler(ScalerMixin):
-    def __init__(self, feature_range=(0, 1)):
+    def __init__(self, feature_range=(0, 1), dtype=None, copy=True):
         if len(feature_range) != 2 or feature_range[0] >= feature_range[1]:
             raise ValueError("feature_range must be a tuple of two values where the first is less than the second")
         self.feature_range = feature_range
+        self.dtype = None if dtype is None else self._check_dtype(dtype)
+        self.copy = copy
+        self._reset()
+
+    def _reset(self):
         self.min_ = None
         self.scale_ = None
+        self.data_min_ = None
+        self.data_max_ = None
+        self._stats = None
+
+    @staticmethod
+    def _compute_stats(X):
+        return np.fmin.reduce(X, axis=0).astype('float64'), np.fmax.reduce(X, axis=0).astype('float64')
 
-    def fit(self, X):
-        X = self._validate_data(X)
-        self.min_ = np.nanmin(X, axis=0)
-        self.scale_ = np.nanmax(X, axis=0) - self.min_
-        
-        # Check for zero scale (division by zero)
+    @staticmethod
+    def _merge_stats(a, b):
+        return np.fmin(a[0], b[0]), np.fmax(a[1], b[1])
+
+    def _check_scale(self):
         if np.any(self.scale_ == 0):
             raise ValueError("One or more features have zero variance, which would lead to division by zero")
-        
+
+    @instrumented
+    def fit(self, X, n_jobs=None):
+        self._reset()
+        if _effective_n_jobs(n_jobs) > 1:
+            self._parallel_fit(X, n_jobs)
+        else:
+            self.partial_fit(X)
+        self._check_scale()
         return self
 
-    def transform(self, X):
+    @instrumented
+    def partial_fit(self, X):
+        """
+        Update the running per-feature minimum and maximum with the rows of ``X``.
+        """
+        self._accumulate_stats(X)
+        self._update_params()
+        return self
+
+    def _update_params(self):
+        self.data_min_, self.data_max_ = self._stats
+        self.min_ = self.data_min_
+        self.scale_ = self.data_max_ - self.data_min_
+
+    @instrumented
+    def transform(self, X, n_threads=None):
         if self.min_ is None or self.scale_ is None:
             raise ValueError("Scaler has not been fitted. Call 'fit' before using 'transform'.")
-        
-        X = self._validate_data(X)
-        X_scaled = (X - self.min_) / self.scale_
-        X_scaled = X_scaled * (self.feature_range[1] - self.feature_range[0]) + self.feature_range[0]
-        return X_scaled
 
+        return self._transform(X, n_threads)
+
+    def _transform_inplace(self, X):
+        np.subtract(X, self.min_.astype(X.dtype, copy=False), out=X)
+        np.divide(X, self.scale_.astype(X.dtype, copy=False), out=X)
+        if self.feature_range[1] - self.feature_range[0] != 1:
+            np.multiply(X, self.feature_range[1] - self.feature_range[0], out=X)
+        if self.feature_range[0] != 0:
+            np.add(X, self.feature_range[0], out=X)
+        return X
+
+    @instrumented
     def fit_transform(self, X):
         return self.fit(X).transform(X)
 
 
 
 class StandardScaler(ScalerMixin):
-    def __init__(self):
+    def __init__(self, dtype=None, copy=True, groupby=None):
+        self.dtype = None if dtype is None else self._check_dtype(dtype)
+        self.copy = copy
+        self.groupby = groupby
+        self._reset()
+
+    def _reset(self):
         self.mean_ = None
         self.scale_ = None
+        self.var_ = None
+        self.n_samples_seen_ = None
+        self.groups_ = None
+        self._stats = None
+
+    _compute_stats = staticmethod(_moments)
+    _merge_stats = staticmethod(_merge_moments)
 
-    def fit(self, X):
-        X = self._validate_data(X)
-        self.mean_ = np.nanmean(X, axis=0)
-        self.scale_ = np.nanstd(X, axis=0)
-        
+    def _check_scale(self):
         if np.any(self.scale_ == 0):
             raise ValueError("One or more features have zero variance, which would lead to division by zero")
-        
+
+    @instrumented
+    def fit(self, X, n_jobs=None):
+        self._reset()
+        if self.groupby is not None:
+            return self._fit_grouped(X)
+        if _effective_n_jobs(n_jobs) > 1:
+            self._parallel_fit(X, n_jobs)
+        else:
+            self.partial_fit(X)
+        self._check_scale()
         return self
 
-    def transform(self, X):
+    def _fit_grouped(self, X):
+        # One row of statistics per group, from a single bincount pass per
+        # feature. Groups where a feature is constant (such as groups of a
+        # single row) are common, so their scale is set to one.
+        codes, n_groups, X = self._fit_groups(X)
+        self._stats = group_moments(X, codes, n_groups)
+        self._update_params()
+        zero_scale = self.scale_ == 0
+        if np.any(zero_scale):
+            warnings.warn("Groups with zero variance detected. These features will not be scaled in those groups.")
+            self.scale_[zero_scale] = 1.0
+        return self
+
+    @instrumented
+    def partial_fit(self, X):
+        """
+        Update the running per-feature count, mean and variance with the rows of ``X``.
+        """
+        self._check_not_grouped('partial_fit')
+        self._accumulate_stats(X)
+        self._update_params()
+        return self
+
+    def _update_params(self):
+        n, mean, m2 = self._stats
+        self.n_samples_seen_ = n
+        self.mean_ = mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.var_ = m2 / n
+        self.scale_ = np.sqrt(self.var_)
+
+    @instrumented
+    def transform(self, X, n_threads=None):
         if self.mean_ is None or self.scale_ is None:
             raise ValueError("Scaler has not been fitted. Call 'fit' before using 'transform'.")
+        if self.groupby is not None:
+            return self._transform_groups(X, self.mean_, self.scale_, n_threads)
+
+        return self._transform(X, n_threads)
 
-        X = self._validate_data(X)
-        X_scaled = (X - self.mean_) / self.scale_
-        return X_scaled
+    def _transform_inplace(self, X):
+        np.subtract(X, self.mean_.astype(X.dtype, copy=False), out=X)
+        np.divide(X, self.scale_.astype(X.dtype, copy=False), out=X)
+        return X
 
+    @instrumented
     def fit_transform(self, X):
         return self.fit(X).transform(X)
 
 
 class MaxAbsScaler(ScalerMixin):
-    def __init__(self):
+    _fitted_attribute = 'max_abs_'
+
+    def __init__(self, dtype=None, copy=True):
+        self.dtype = None if dtype is None else self._check_dtype(dtype)
+        self.copy = copy
+        self._reset()
+
+    def _reset(self):
         self.max_abs_ = None
+        self._stats = None
+
+    @staticmethod
+    def _compute_stats(X):
+        # Reduce in row blocks so that np.abs never materialises a full copy.
+        max_abs = functools.reduce(np.fmax, (np.fmax.reduce(np.abs(block), axis=0) for block in _row_blocks(X)))
+        return (max_abs.astype('float64'),)
 
-    def fit(self, X):
-        X = self._validate_data(X)
-        self.max_abs_ = np.nanmax(np.abs(X), axis=0)
-        
+    @staticmethod
+    def _merge_stats(a, b):
+        return (np.fmax(a[0], b[0]),)
+
+    def _check_scale(self):
         if np.any(self.max_abs_ == 0):
             raise ValueError("One or more features have all zero values, which would lead to division by zero")
-        
+
+    @instrumented
+    def fit(self, X, n_jobs=None):
+        self._reset()
+        if _effective_n_jobs(n_jobs) > 1:
+            self._parallel_fit(X, n_jobs)
+        else:
+            self.partial_fit(X)
+        self._check_scale()
+        return self
+
+    @instrumented
+    def partial_fit(self, X):
+        """
+        Update the running per-feature maximum absolute value with the rows of ``X``.
+        """
+        self._accumulate_stats(X)
+        self._update_params()
         return self
 
-    def transform(self, X):
-        X = self._validate_data(X)
-        
+    def _update_params(self):
+        self.max_abs_, = self._stats
+
+    @instrumented
+    def transform(self, X, n_threads=None):
         if self.max_abs_ is None:
             raise ValueError("Scaler has not been fitted. Call 'fit' before using 'transform'.")
-        
-        X_scaled = X / self.max_abs_
-        return X_scaled
 
+        return self._transform(X, n_threads)
+
+    def _transform_inplace(self, X):
+        np.divide(X, self.max_abs_.astype(X.dtype, copy=False), out=X)
+        return X
+
+    @instrumented
     def fit_transform(self, X):
         return self.fit(X).transform(X)
 
+
+def _sketch_stats(X, k, seed):
+    rng = np.random.default_rng(seed)
+    return ([QuantileSketch(k, rng).update(column) for column in X.T],)
+
+
 class RobustScaler(ScalerMixin):
-    def __init__(self, quantile_range=(25.0, 75.0)):
+    """
+    Scale features using statistics that are robust to outliers.
+
+    With ``method='exact'`` the median and quantiles are computed with
+    ``np.nanmedian``/``np.nanpercentile`` over the whole array. With
+    ``method='sketch'`` every feature is summarised by a mergeable quantile
+    sketch instead: the scaler can then be updated chunk by chunk with
+    ``partial_fit`` (``fit_csv`` streams the file), scalers fitted on
+    different shards can be combined with ``merge``, and ``rank_error_``
+    reports the normalised rank error bound that was achieved.
+
+    Parameters
+    ----------
+    quantile_range : tuple
+        Lower and upper percentiles used to compute the scale.
+    method : str
+        'exact' or 'sketch'.
+    sketch_k : int
+        Accuracy parameter of the sketches (only used by ``method='sketch'``).
+    random_state : int, optional
+        Seed for the sketch compactions.
+    dtype : str or np.dtype
+        Floating point dtype of the validated input and of the output; by
+        default float32 input stays float32 and other input becomes float64.
+    copy : bool
+        If False, ``transform`` overwrites contiguous ndarray input of the
+        right dtype instead of copying it (see ``ScalerMixin``).
+    groupby : str or list, optional
+        Column(s) of the DataFrame defining groups that get their own median
+        and quantiles (``method='exact'`` only). All groups are computed
+        from one sort per feature, with the values of ``np.nanmedian`` and
+        ``np.nanpercentile`` on each group.
+    """
+
+    def __init__(self, quantile_range=(25.0, 75.0), method='exact', sketch_k=200, random_state=None,
+                 dtype=None, copy=True, groupby=None):
+        if method not in ('exact', 'sketch'):
+            raise ValueError("method must be 'exact' or 'sketch'")
+        if groupby is not None and method != 'exact':
+            raise ValueError("groupby requires method='exact'")
         self.quantile_range = quantile_range
+        self.method = method
+        self.sketch_k = sketch_k
+        self.random_state = random_state
+        self.dtype = None if dtype is None else self._check_dtype(dtype)
+        self.copy = copy
+        self.groupby = groupby
+        self._reset()
+
+    def _reset(self):
         self.center_ = None
         self.scale_ = None
+        self.rank_error_ = None
+        self.groups_ = None
+        self._stats = None
+        self._rng = np.random.default_rng(self.random_state)
 
-    def fit(self, X):
-        X = self._validate_data(X)
+    def _supports_partial_fit(self):
+        return self.method == 'sketch'
+
+    def _check_quantile_range(self):
         q_min, q_max = self.quantile_range
         if not 0 <= q_min < q_max <= 100:
             raise ValueError("Invalid quantile range: {}".format(self.quantile_range))
 
-        self.center_ = np.nanmedian(X, axis=0)
-        q = np.nanpercentile(X, self.quantile_range, axis=0)
+    def _compute_stats(self, X):
+        return ([QuantileSketch(self.sketch_k, self._rng).update(column) for column in X.T],)
+
+    def _shard_stats_functions(self, n_shards):
+        # Every shard gets its own seed so that compactions stay independent.
+        seeds = self._rng.integers(2 ** 63, size=n_shards)
+        return [functools.partial(_sketch_stats, k=self.sketch_k, seed=int(seed)) for seed in seeds]
+
+    @staticmethod
+    def _merge_stats(a, b):
+        return ([left.merge(right) for left, right in zip(a[0], b[0])],)
+
+    def _set_scale(self, center, q):
+        self.center_ = center
         self.scale_ = (q[1] - q[0])
-        
+
         # Check for features with zero interquartile range
         zero_scale = self.scale_ == 0
         if np.any(zero_scale):
             warnings.warn("Features with zero interquartile range detected. These features will not be scaled.")
             self.scale_[zero_scale] = 1.0
 
+    def _update_params(self):
+        sketches = self._stats[0]
+        quantiles = np.array([0.5, self.quantile_range[0] / 100.0, self.quantile_range[1] / 100.0])
+        estimates = np.column_stack([sketch.quantile(quantiles) for sketch in sketches])
+        self._set_scale(estimates[0], estimates[1:])
+        self.rank_error_ = max(sketch.rank_error() for sketch in sketches)
+
+    def _check_scale(self):
+        # Zero scales are replaced by one when the scale is set.
+        pass
+
+    @instrumented
+    def fit(self, X, n_jobs=None):
+        self._check_quantile_range()
+        if self.method == 'sketch':
+            self._reset()
+            if _effective_n_jobs(n_jobs) > 1:
+                return self._parallel_fit(X, n_jobs)
+            return self.partial_fit(X)
+        if _effective_n_jobs(n_jobs) > 1:
+            raise ValueError("n_jobs > 1 requires method='sketch'; exact quantiles cannot be merged across shards")
+
+        if self.groupby is not None:
+            codes, n_groups, X = self._fit_groups(X)
+            stats = group_quantiles(X, codes, n_groups, self.quantile_range, median=True)
+            self._set_scale(stats[0], stats[1:])
+        else:
+            self._set_feature_names(X)
+            X = self._validate_data(X, copy=False)
+            self._set_scale(np.nanmedian(X, axis=0), np.nanpercentile(X, self.quantile_range, axis=0))
+        self.rank_error_ = 0.0
         return self
 
-    def transform(self, X):
-        X = self._validate_data(X)
-        
+    @instrumented
+    def partial_fit(self, X):
+        """
+        Update the per-feature quantile sketches with the rows of ``X``.
+
+        Only available with ``method='sketch'``.
+        """
+        if self.method != 'sketch':
+            raise ValueError("partial_fit requires method='sketch'; exact quantiles need all rows at once")
+        self._check_quantile_range()
+        self._accumulate_stats(X)
+        self._update_params()
+        return self
+
+    def merge(self, other):
+        """
+        Fold the sketches of another sketch-mode RobustScaler (e.g. one fitted
+        on a different shard of the data) into this one.
+        """
+        if not isinstance(other, RobustScaler) or self.method != 'sketch' or other.method != 'sketch':
+            raise ValueError("Only RobustScalers with method='sketch' can be merged")
+        if other._stats is None:
+            return self
+        if self._stats is None:
+            self._stats = ([QuantileSketch(self.sketch_k, self._rng) for _ in other._stats[0]],)
+        if len(self._stats[0]) != len(other._stats[0]):
+            raise ValueError("Cannot merge scalers fitted on a different number of features")
+        self._stats = self._merge_stats(self._stats, other._stats)
+        self._update_params()
+        return self
+
+    @instrumented
+    def transform(self, X, n_threads=None):
         if self.center_ is None or self.scale_ is None:
             raise ValueError("RobustScaler has not been fitted. Call 'fit' before using 'transform'.")
-        
-        X_scaled = (X - self.center_) / self.scale_
-        return X_scaled
+        if self.groupby is not None:
+            return self._transform_groups(X, self.center_, self.scale_, n_threads)
 
+        return self._transform(X, n_threads)
+
+    def _transform_inplace(self, X):
+        np.subtract(X, self.center_.astype(X.dtype, copy=False), out=X)
+        np.divide(X, self.scale_.astype(X.dtype, copy=False), out=X)
+        return X
+
+    @instrumented
     def fit_transform(self, X):
-        return self.fit(X).transform(X)
+        return self.fit(X).transform(X)
\ No newline at end of file
@@ -1,33 +1,68 @@
 import pandas as pd
 import numpy as np
+from ._utils import BLOCK_BYTES, MIN_BLOCK_ROWS, MIN_THREADED_ELEMENTS, _effective_n_jobs, _run_in_blocks
+from .instrumentation import instrumented
+
+NORMALIZE_METHODS = ('Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power')
+# Methods of the fitted transformer; the last two need scipy.
+TRANSFORM_METHODS = NORMALIZE_METHODS + ('BoxCox', 'YeoJohnson')
 
 
 class DataTransformation:
     """
     A class used to perform various data transformation techniques.
 
+    ``normalize_data`` and ``standardize_data`` compute their statistics from
+    the data they are given on every call. Constructed with a method, the class
+    is also a fitted transformer: ``fit`` learns the per-column statistics once
+    and ``transform`` applies them to any later data, so training and serving
+    use the same statistics. ``transform`` validates and transforms each row
+    block in one pass with in-place ufuncs, and on the data it was fitted on
+    its result is identical to ``normalize_data``.
+
+    Parameters:
+    method (str, optional): One of 'Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power',
+                            'BoxCox' or 'YeoJohnson'; required by fit/transform only.
+    block_rows (int, optional): Rows per block of ``transform``; chosen from the width when omitted.
+
+    Attributes (after fit):
+    feature_names_in_ (pd.Index): The fitted columns, in order.
+    shift_ (np.ndarray or None): Per-column mean ('Standard') or minimum ('MinMax').
+    scale_ (np.ndarray or None): Per-column standard deviation, range or maximum absolute value.
+    lambdas_ (np.ndarray or None): Per-column maximum likelihood lambdas of 'BoxCox' and 'YeoJohnson'.
+
     Methods
     -------
-    normalize_data(data, method)
+    normalize_data(data, method, n_threads=None)
         Normalize the data using the specified method.
 
     standardize_data(data)
         Standardize the data to have a mean of 0 and a standard deviation of 1.
+
+    fit(data), transform(data), fit_transform(data)
+        Learn the statistics of ``method`` and apply them.
     """
 
-    def __init__(self):
+    def __init__(self, method: str = None, block_rows: int = None):
         """
         Initialize the DataTransformation class.
         """
-        pass  # Currently, there's no initialization needed
+        if method is not None and method not in TRANSFORM_METHODS:
+            raise ValueError('Method must be "Standard", "MinMax", "MaxAbsoluteScaling", "Log", "Power", '
+                             '"BoxCox", or "YeoJohnson"')
+        self.method = method
+        self.block_rows = block_rows
 
-    def normalize_data(self, data: pd.DataFrame, method: str) -> pd.DataFrame:
+    @instrumented
+    def normalize_data(self, data: pd.DataFrame, method: str, n_threads: int = None) -> pd.DataFrame:
         """
         Normalize the data using the specified method.
 
         Parameters:
         data (pd.DataFrame): The input data to be normalized.
         method (str): The normalization method to use ('Standard', 'MinMax', 'MaxAbsoluteScaling', 'Log', 'Power').
+        n_threads (int, optional): Number of threads applying the transform to column blocks of a float64
+                                   DataFrame (-1 for all CPUs). The result is identical to the single-threaded one.
 
         Returns:
         pd.DataFrame: The normalized data.
@@ -46,6 +81,10 @@ class DataTransformation:
 
         normalized_data = pd.DataFrame()
 
+        if (method in NORMALIZE_METHODS and _effective_n_jobs(n_threads) > 1
+                and data.size >= MIN_THREADED_ELEMENTS and (data.dtypes == np.float64).all()):
+            return self._normalize_threaded(data, method, _effective_n_jobs(n_threads))
+
         if method == 'Standard':
             normalized_data = (data - data.mean()) / data.std()
         elif method == 'MinMax':
@@ -65,6 +104,212 @@ class DataTransformation:
 
         return normalized_data
 
+    def _normalize_threaded(self, data: pd.DataFrame, method: str, n_threads: int) -> pd.DataFrame:
+        # The statistics come from the same pandas reductions as the
+        # single-threaded path and the element-wise steps are the same
+        # ufuncs, so only the scheduling differs.
+        if method == 'Log' and (data <= 0).any().any():
+            raise ValueError("Log transformation requires all values to be positive.")
+        if method == 'Power' and (data < 0).any().any():
+            raise ValueError("Power transformation requires all values to be non-negative.")
+        if method == 'Standard':
+            shift, scale = data.mean().to_numpy(), data.std().to_numpy()
+        elif method == 'MinMax':
+            shift = data.min().to_numpy()
+            scale = (data.max() - data.min()).to_numpy()
+        elif method == 'MaxAbsoluteScaling':
+            shift, scale = None, data.abs().max().to_numpy()
+
+        values = data.to_numpy()
+        out = np.empty(values.shape, order='F')
+
+        def transform_columns(start, stop):
+            x, o = values[:, start:stop], out[:, start:stop]
+            if method == 'Log':
+                np.log1p(x, out=o)
+            elif method == 'Power':
+                np.power(x, 0.5, out=o)
+            elif shift is None:
+                np.divide(x, scale[start:stop], out=o)
+            else:
+                np.subtract(x, shift[start:stop], out=o)
+                np.divide(o, scale[start:stop], out=o)
+
+        _run_in_blocks(transform_columns, values.shape[1], n_threads)
+        return pd.DataFrame(out, index=data.index, columns=data.columns, copy=False)
+
+    @instrumented
+    def fit(self, data: pd.DataFrame) -> 'DataTransformation':
+        """
+        Learn the per-column statistics of the method.
+
+        The statistics come from the same pandas reductions as ``normalize_data``.
+
+        Parameters:
+        data (pd.DataFrame): Numeric data without missing values.
+
+        Returns:
+        DataTransformation: The fitted transformer.
+
+        Raises:
+        ValueError: If no method was given, or if the data is not a numeric DataFrame without missing values
+                    (or has values outside the domain of 'Log', 'Power' or 'BoxCox').
+        """
+        if self.method is None:
+            raise ValueError("A method is needed to fit, e.g. DataTransformation('Standard').")
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        if data.isnull().values.any():
+            raise ValueError("Input data contains missing values. Please handle missing data before normalization.")
+        if not all(data.dtypes.apply(lambda x: np.issubdtype(x, np.number))):
+            raise ValueError("All columns in the input data must be numeric.")
+
+        method = self.method
+        self.feature_names_in_ = data.columns
+        self.shift_ = self.scale_ = self.lambdas_ = None
+        if method == 'Standard':
+            self.shift_, self.scale_ = data.mean().to_numpy(), data.std().to_numpy()
+        elif method == 'MinMax':
+            self.shift_ = data.min().to_numpy()
+            self.scale_ = (data.max() - data.min()).to_numpy()
+        elif method == 'MaxAbsoluteScaling':
+            self.scale_ = data.abs().max().to_numpy()
+        elif method in ('BoxCox', 'YeoJohnson'):
+            from scipy import stats
+
+            values = data.to_numpy(dtype=np.float64)
+            if method == 'BoxCox':
+                if (values <= 0).any():
+                    raise ValueError("Box-Cox transformation requires all values to be positive.")
+                self.lambdas_ = np.array([stats.boxcox_normmax(values[:, j], method='mle')
+                                          for j in range(values.shape[1])], dtype=np.float64)
+            else:
+                self.lambdas_ = np.array([stats.yeojohnson_normmax(values[:, j])
+                                          for j in range(values.shape[1])], dtype=np.float64)
+        return self
+
+    @instrumented
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the fitted method in one pass over row blocks.
+
+        Each block is checked for missing values and for the domain of the
+        method, then transformed with in-place ufuncs into the preallocated
+        result, so no full-size temporary is made. Columns sharing a dtype are
+        processed together, and each result column has the dtype
+        ``normalize_data`` gives it.
+
+        Parameters:
+        data (pd.DataFrame): Numeric data with the fitted columns.
+
+        Returns:
+        pd.DataFrame: The transformed data.
+
+        Raises:
+        ValueError: If the transformer is not fitted, a fitted column is missing, or the data is not
+                    numeric, has missing values or has values outside the domain of the method.
+        """
+        if not hasattr(self, 'feature_names_in_'):
+            raise ValueError("This DataTransformation instance is not fitted yet. Call 'fit' first.")
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        if not data.columns.equals(self.feature_names_in_):
+            missing = self.feature_names_in_.difference(data.columns)
+            if len(missing):
+                raise ValueError(f"Columns {list(missing)} were fitted but are missing from the data.")
+            data = data[self.feature_names_in_]
+        if not all(data.dtypes.apply(lambda x: np.issubdtype(x, np.number))):
+            raise ValueError("All columns in the input data must be numeric.")
+
+        groups = {}
+        for position, dtype in enumerate(data.dtypes):
+            groups.setdefault(dtype, []).append(position)
+        block_rows = self.block_rows
+        if block_rows is None:
+            block_rows = max(MIN_BLOCK_ROWS, BLOCK_BYTES // max(1, data.shape[1] * 8))
+
+        columns = {}
+        for dtype, positions in groups.items():
+            values = data.to_numpy() if len(groups) == 1 else data.iloc[:, positions].to_numpy()
+            if self.method in ('BoxCox', 'YeoJohnson'):
+                values = values.astype(np.float64, copy=False)
+            shift, scale, lambdas = (None if param is None else param[positions]
+                                     for param in (self.shift_, self.scale_, self.lambdas_))
+            out = np.empty(values.shape, dtype=self._output_dtype(values.dtype, shift, scale), order='F')
+            for start in range(0, len(values), block_rows):
+                self._transform_block(values[start:start + block_rows], out[start:start + block_rows],
+                                      shift, scale, lambdas)
+            if len(groups) == 1:
+                return pd.DataFrame(out, index=data.index, columns=data.columns, copy=False)
+            columns.update(zip(positions, out.T))
+
+        result = pd.DataFrame({position: columns[position] for position in range(data.shape[1])},
+                              index=data.index, copy=False)
+        result.columns = data.columns
+        return result
+
+    @instrumented
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit to the data, then transform it.
+
+        Parameters:
+        data (pd.DataFrame): Numeric data without missing values.
+
+        Returns:
+        pd.DataFrame: The transformed data.
+        """
+        return self.fit(data).transform(data)
+
+    def _output_dtype(self, dtype, shift, scale):
+        # Running the method's ufuncs on a one-element probe gives the dtype
+        # pandas arithmetic would give the column, e.g. float32 stays float32
+        # under 'Log' and integers become float64.
+        probe = np.ones(1, dtype=dtype)
+        if self.method == 'Log':
+            return np.log1p(probe).dtype
+        if self.method == 'Power':
+            return np.power(probe, 0.5).dtype
+        if self.method == 'MaxAbsoluteScaling':
+            return np.divide(probe, scale[:1]).dtype
+        if self.method in ('Standard', 'MinMax'):
+            return np.divide(np.subtract(probe, shift[:1]), scale[:1]).dtype
+        return np.dtype(np.float64)
+
+    def _transform_block(self, x, out, shift, scale, lambdas):
+        method = self.method
+        if x.dtype.kind in 'fc' and np.isnan(x).any():
+            raise ValueError("Input data contains missing values. Please handle missing data before normalization.")
+        if method == 'Log' and (x <= 0).any():
+            raise ValueError("Log transformation requires all values to be positive.")
+        if method == 'Power' and (x < 0).any():
+            raise ValueError("Power transformation requires all values to be non-negative.")
+        if method == 'BoxCox' and (x <= 0).any():
+            raise ValueError("Box-Cox transformation requires all values to be positive.")
+
+        if method == 'Log':
+            np.log1p(x, out=out)
+        elif method == 'Power':
+            np.power(x, 0.5, out=out)
+        elif method == 'MaxAbsoluteScaling':
+            np.divide(x, scale, out=out)
+        elif method in ('Standard', 'MinMax'):
+            if np.result_type(x, shift) == out.dtype:
+                np.subtract(x, shift, out=out)
+                np.divide(out, scale, out=out)
+            else:
+                # Integer minus integer stays integer in pandas before the
+                # true division, so the difference needs its own buffer.
+                np.divide(np.subtract(x, shift), scale, out=out)
+        elif method == 'BoxCox':
+            from scipy import special
+
+            special.boxcox(x, lambdas, out=out)
+        else:
+            for j, lmbda in enumerate(lambdas):
+                _yeo_johnson(x[:, j], lmbda, out[:, j])
+
+    @instrumented
     def standardize_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Standardize the data to have a mean of 0 and a standard deviation of 1.
@@ -88,4 +333,18 @@ class DataTransformation:
             raise ValueError("All columns in the input data must be numeric.")
 
         standardized_data = (data - data.mean()) / data.std()
-        return standardized_data
\ No newline at end of file
+        return standardized_data
+
+def _yeo_johnson(x: np.ndarray, lmbda: float, out: np.ndarray):
+    # The formulas of scipy.stats.yeojohnson, written into ``out``.
+    eps = np.finfo(np.float64).eps
+    positive = x >= 0
+    negative = ~positive
+    if abs(lmbda) < eps:
+        out[positive] = np.log1p(x[positive])
+    else:
+        out[positive] = np.expm1(lmbda * np.log1p(x[positive])) / lmbda
+    if abs(lmbda - 2) > eps:
+        out[negative] = -np.expm1((2 - lmbda) * np.log1p(-x[negative])) / (2 - lmbda)
+    else:
+        out[negative] = -np.log1p(-x[negative])
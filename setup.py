@@ -16,7 +16,11 @@ setup(
     long_description_content_type="text/markdown",
     long_description=LONG_DESCRIPTION,
     packages=find_packages(),
-    install_requires=['scikit-learn', 'numpy', 'pandas', 'seaborn', 'matplotlib'],
+    install_requires=['scikit-learn', 'numpy', 'pandas', 'scipy'],
+    extras_require={
+        'plot': ['seaborn', 'matplotlib'],
+        'arrow': ['pyarrow'],
+    },
     keywords=['python', 'data', 'preprocessing', 'data science', 'data analysis', 'machine learning'],
     classifiers=[
         "Development Status :: 1 - Planning",